@@ -11,6 +11,8 @@ from utils.logger import logger
 class BaseAgent(ABC):
     """Base class for all AI agents."""
     
+    __slots__ = ('name', 'start_time', 'end_time')
+    
     def __init__(self, name: str):
         self.name = name
         self.start_time = None
@@ -39,15 +41,15 @@ class BaseAgent(ABC):
         Returns:
             Dictionary containing processing results
         """
-        self.start_time = time.time()
-        logger.info(f"Starting {self.name} agent processing")
+        self.start_time = time.perf_counter()
+        logger.info("Starting %s agent processing", self.name)
         
         try:
             result = await self.process(input_data)
-            self.end_time = time.time()
+            self.end_time = time.perf_counter()
             processing_time = self.end_time - self.start_time
             
-            logger.info(f"{self.name} agent completed in {processing_time:.2f}s")
+            logger.info("%s agent completed in %.2fs", self.name, processing_time)
             
             return {
                 "agent_name": self.name,
@@ -58,10 +60,10 @@ class BaseAgent(ABC):
             }
             
         except Exception as e:
-            self.end_time = time.time()
+            self.end_time = time.perf_counter()
             processing_time = self.end_time - self.start_time
             
-            logger.error(f"{self.name} agent failed after {processing_time:.2f}s: {str(e)}")
+            logger.error("%s agent failed after %.2fs: %s", self.name, processing_time, e)
             
             return {
                 "agent_name": self.name,
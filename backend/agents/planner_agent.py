@@ -2,27 +2,253 @@
 Planner Agent - Generates personalized daily care plans and checklists.
 """
 import asyncio
-from typing import Dict, Any, List
+import re
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 from agents.base_agent import BaseAgent
-from models import MedicationInfo, ActionItem, CarePlan
+from models import MedicationInfo, ActionItem, CarePlan, ExplainedTerm
 from utils.logger import logger
 
+# Patterns for pulling medication details and contacts out of document text
+_DOSAGE_RE = re.compile(r'(\d+\s*mg)')
+_QTY_RE = re.compile(r'qty:\s*(\d+)')
+_REFILL_RE = re.compile(r'refill[s]?:\s*(\d+)')
+_PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_DOCTOR_RE = re.compile(r'Dr\.\s+[A-Z][a-z]+\s+[A-Z][a-z]+')
+
+# Keyword -> flag tables for frequency (once/twice/three times) and instructions (mouth/food/water)
+_FREQ_KWS = (('daily', 1), ('every day', 1), ('twice', 2), ('2 times', 2), ('three times', 4), ('3 times', 4))
+_INSTR_KWS = (('mouth', 1), ('food', 2), ('water', 4))
+
+# How far past a medication name to look for its dosage, quantity and refills
+_DETAIL_WINDOW = 120
+
+# Lifestyle tips by condition
+_LIFESTYLE_TIPS_DB: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    'hypertension': (
+        'Monitor your blood pressure at home once a week and keep a log',
+        'Maintain a low-sodium diet (less than 2,300mg per day)',
+        'Engage in regular physical activity (30 minutes most days)',
+        'Limit alcohol consumption to moderate levels',
+        'Manage stress through relaxation techniques like deep breathing',
+        'Maintain a healthy weight',
+        'Get 7-9 hours of quality sleep each night',
+        'Limit caffeine intake if it affects your blood pressure'
+    ),
+    'diabetes': (
+        'Check your blood sugar levels as recommended by your doctor',
+        'Follow a consistent meal schedule with balanced portions',
+        'Choose complex carbohydrates over simple sugars',
+        'Stay physically active - even a 10-minute walk helps',
+        'Keep your feet clean and dry, check for cuts or sores daily',
+        'Stay hydrated by drinking plenty of water',
+        'Plan ahead for meals and snacks',
+        'Work with a diabetes educator or nutritionist'
+    ),
+    'high_cholesterol': (
+        'Choose lean proteins like fish, chicken, and beans',
+        'Increase fiber intake with fruits, vegetables, and whole grains',
+        'Limit saturated and trans fats',
+        'Include heart-healthy fats like olive oil and nuts',
+        'Exercise regularly to help raise HDL (good) cholesterol',
+        'Maintain a healthy weight',
+        'Limit processed foods and fast food',
+        'Consider working with a nutritionist'
+    ),
+    'general': (
+        'Take medications at the same time each day',
+        'Keep a medication list with you at all times',
+        'Use a pill organizer to stay organized',
+        'Set reminders on your phone for medications',
+        'Keep all medical appointments',
+        'Ask questions if you don\'t understand something',
+        'Keep emergency contact information handy',
+        'Maintain a positive attitude about your health'
+    )
+})
+
+# Emergency contacts added to every care plan
+_EMERGENCY_CONTACTS_DB: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    'general': (
+        'Emergency Services: 911',
+        'Poison Control: 1-800-222-1222',
+        'National Suicide Prevention Lifeline: 988'
+    ),
+    'medical': (
+        'Your Primary Care Doctor',
+        'Your Pharmacy',
+        'Local Emergency Room',
+        'Urgent Care Center'
+    )
+})
+
+# Action items added for every document of a given type
+_DOCUMENT_ACTION_ITEMS: Mapping[str, Tuple[ActionItem, ...]] = MappingProxyType({
+    'prescription': (
+        ActionItem(
+            title="Pick up prescription",
+            description="Go to the pharmacy to pick up your prescription",
+            priority="high",
+            timeframe="As soon as possible",
+            completed=False
+        ),
+        ActionItem(
+            title="Set up medication reminders",
+            description="Set up phone reminders for your medication schedule",
+            priority="medium",
+            timeframe="Today",
+            completed=False
+        )
+    ),
+    'discharge_summary': (
+        ActionItem(
+            title="Schedule follow-up appointment",
+            description="Call your doctor to schedule the recommended follow-up appointment",
+            priority="high",
+            timeframe="Within 1 week",
+            completed=False
+        ),
+        ActionItem(
+            title="Review discharge instructions",
+            description="Read through all discharge instructions carefully",
+            priority="high",
+            timeframe="Today",
+            completed=False
+        )
+    ),
+    'lab_results': (
+        ActionItem(
+            title="Discuss results with doctor",
+            description="Schedule an appointment to discuss your lab results",
+            priority="high",
+            timeframe="Within 2 weeks",
+            completed=False
+        ),
+        ActionItem(
+            title="Implement lifestyle changes",
+            description="Start any recommended lifestyle changes based on your results",
+            priority="medium",
+            timeframe="This week",
+            completed=False
+        )
+    )
+})
+
+# Action items added for every document
+_GENERAL_ACTION_ITEMS = (
+    ActionItem(
+        title="Keep medical records organized",
+        description="File this document with your other medical records",
+        priority="low",
+        timeframe="This week",
+        completed=False
+    ),
+    ActionItem(
+        title="Update emergency contacts",
+        description="Make sure your emergency contacts have your current medical information",
+        priority="medium",
+        timeframe="This month",
+        completed=False
+    )
+)
+
+
+def _keyword_flags(line_lower: str, keywords: Tuple[Tuple[str, int], ...]) -> int:
+    """Combine the flags of every keyword found in a line."""
+    flags = 0
+    for keyword, flag in keywords:
+        # Skip synonyms of a flag that is already set
+        if not flags & flag and keyword in line_lower:
+            flags |= flag
+    return flags
+
+
+def _scan_line(line_lower: str) -> Tuple[Optional[str], int, int, Optional[int], Optional[int]]:
+    """
+    Scan a lowercased medication line for its dosage, keyword flags, quantity and refills.
+    
+    Returns:
+        Tuple of (dosage, frequency flags, instruction flags, quantity, refills)
+    """
+    dosage_match = _DOSAGE_RE.search(line_lower)
+    qty_match = _QTY_RE.search(line_lower)
+    refill_match = _REFILL_RE.search(line_lower)
+    
+    return (
+        dosage_match.group(1).upper() if dosage_match else None,
+        _keyword_flags(line_lower, _FREQ_KWS),
+        _keyword_flags(line_lower, _INSTR_KWS),
+        int(qty_match.group(1)) if qty_match else None,
+        int(refill_match.group(1)) if refill_match else None
+    )
+
+
+def _classify_medication(name_lower: str) -> Optional[str]:
+    """Return the lifestyle tip category a medication points to, if any."""
+    if 'blood pressure' in name_lower or 'lisinopril' in name_lower:
+        return 'hypertension'
+    elif 'diabetes' in name_lower or 'metformin' in name_lower:
+        return 'diabetes'
+    elif 'cholesterol' in name_lower or 'atorvastatin' in name_lower:
+        return 'high_cholesterol'
+    return None
+
+
+@lru_cache(maxsize=256)
+def _compute_lifestyle_tips(conditions: FrozenSet[str], medication_tags: FrozenSet[str]) -> Tuple[str, ...]:
+    """
+    Assemble deduplicated lifestyle tips for a set of conditions and medication categories.
+    
+    The result only depends on the static tips database, so it is cached per input.
+    """
+    tips: List[str] = []
+    
+    # Get tips based on conditions
+    for condition, condition_tips in _LIFESTYLE_TIPS_DB.items():
+        if condition in conditions:
+            tips.extend(condition_tips)
+    
+    # Add general tips
+    tips.extend(_LIFESTYLE_TIPS_DB['general'])
+    
+    # Add medication-specific tips
+    for tag, tag_tips in _LIFESTYLE_TIPS_DB.items():
+        if tag in medication_tags:
+            tips.extend(tag_tips)
+    
+    # Remove duplicates while keeping the order tips were added in
+    return tuple(dict.fromkeys(tips))
+
+
+@dataclass(frozen=True)
+class _DocumentScan:
+    """Document text details shared by the planner's helpers."""
+    text_lower: str
+    phone_numbers: List[str]
+    doctors: List[str]
+
 
 class PlannerAgent(BaseAgent):
     """Agent responsible for generating personalized care plans and daily checklists."""
     
+    # All lookup tables are module constants, so instances only carry BaseAgent's slots
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__("Planner")
-        self.lifestyle_tips_db = self._initialize_lifestyle_tips()
-        self.emergency_contacts_db = self._initialize_emergency_contacts()
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate personalized care plan and daily checklist.
         
         Args:
-            input_data: Dictionary containing all previous agent outputs
+            input_data: Dictionary containing 'raw_text', 'document_type' and 'simplified_terms';
+                runs alongside ResourceAgent, so it must not depend on resource outputs
             
         Returns:
             Dictionary containing complete care plan
@@ -30,24 +256,27 @@ class PlannerAgent(BaseAgent):
         raw_text = input_data.get('raw_text', '')
         document_type = input_data.get('document_type', 'unknown')
         simplified_terms = input_data.get('simplified_terms', [])
-        cost_savings = input_data.get('cost_savings', [])
         
-        logger.info(f"Generating care plan for {document_type} document")
+        logger.info("Generating care plan for %s document", document_type)
+        
+        # Group the simplified terms by category once for the helpers below
+        terms_by_category: Dict[str, List[ExplainedTerm]] = {}
+        for term in simplified_terms:
+            terms_by_category.setdefault(term.category, []).append(term)
+        
+        # Scan the document text once for everything the helpers below need
+        scan = self._scan_document(raw_text)
         
         # Extract medications from the document
-        medications = await self._extract_medications(raw_text, simplified_terms)
+        medications = await self._extract_medications(scan, terms_by_category.get('medication', []))
         
         # Generate action items based on document type and content
         action_items = await self._generate_action_items(raw_text, document_type, medications)
         
-        # Generate lifestyle tips based on conditions and medications
-        lifestyle_tips = await self._generate_lifestyle_tips(medications, simplified_terms)
-        
-        # Generate follow-up instructions
-        follow_up_instructions = await self._generate_follow_up_instructions(document_type, medications)
-        
-        # Generate emergency contacts
-        emergency_contacts = await self._generate_emergency_contacts(document_type, raw_text)
+        # The remaining sections are pure in-memory lookups, so call them directly
+        lifestyle_tips = self._generate_lifestyle_tips(medications, terms_by_category.get('condition', []))
+        follow_up_instructions = self._generate_follow_up_instructions(document_type, medications)
+        emergency_contacts = self._generate_emergency_contacts(document_type, scan)
         
         # Create the complete care plan
         care_plan = CarePlan(
@@ -59,170 +288,164 @@ class PlannerAgent(BaseAgent):
             emergency_contacts=emergency_contacts
         )
         
+        # Medication tasks shared by the daily checklist and weekly schedule
+        checklist_tasks, schedule_tasks = self._build_medication_tasks(medications)
+        
         return {
             "care_plan": care_plan,
-            "daily_checklist": self._generate_daily_checklist(medications, action_items),
-            "weekly_schedule": self._generate_weekly_schedule(medications, action_items),
+            "daily_checklist": self._generate_daily_checklist(checklist_tasks, action_items),
+            "weekly_schedule": self._generate_weekly_schedule(schedule_tasks, action_items),
             "priority_levels": self._assign_priority_levels(action_items),
             "completion_tracking": self._generate_completion_tracking(action_items)
         }
     
-    def _initialize_lifestyle_tips(self) -> Dict[str, List[str]]:
-        """Initialize database of lifestyle tips by condition."""
-        return {
-            'hypertension': [
-                'Monitor your blood pressure at home once a week and keep a log',
-                'Maintain a low-sodium diet (less than 2,300mg per day)',
-                'Engage in regular physical activity (30 minutes most days)',
-                'Limit alcohol consumption to moderate levels',
-                'Manage stress through relaxation techniques like deep breathing',
-                'Maintain a healthy weight',
-                'Get 7-9 hours of quality sleep each night',
-                'Limit caffeine intake if it affects your blood pressure'
-            ],
-            'diabetes': [
-                'Check your blood sugar levels as recommended by your doctor',
-                'Follow a consistent meal schedule with balanced portions',
-                'Choose complex carbohydrates over simple sugars',
-                'Stay physically active - even a 10-minute walk helps',
-                'Keep your feet clean and dry, check for cuts or sores daily',
-                'Stay hydrated by drinking plenty of water',
-                'Plan ahead for meals and snacks',
-                'Work with a diabetes educator or nutritionist'
-            ],
-            'high_cholesterol': [
-                'Choose lean proteins like fish, chicken, and beans',
-                'Increase fiber intake with fruits, vegetables, and whole grains',
-                'Limit saturated and trans fats',
-                'Include heart-healthy fats like olive oil and nuts',
-                'Exercise regularly to help raise HDL (good) cholesterol',
-                'Maintain a healthy weight',
-                'Limit processed foods and fast food',
-                'Consider working with a nutritionist'
-            ],
-            'general': [
-                'Take medications at the same time each day',
-                'Keep a medication list with you at all times',
-                'Use a pill organizer to stay organized',
-                'Set reminders on your phone for medications',
-                'Keep all medical appointments',
-                'Ask questions if you don\'t understand something',
-                'Keep emergency contact information handy',
-                'Maintain a positive attitude about your health'
-            ]
-        }
-    
-    def _initialize_emergency_contacts(self) -> Dict[str, List[str]]:
-        """Initialize emergency contacts database."""
-        return {
-            'general': [
-                'Emergency Services: 911',
-                'Poison Control: 1-800-222-1222',
-                'National Suicide Prevention Lifeline: 988'
-            ],
-            'medical': [
-                'Your Primary Care Doctor',
-                'Your Pharmacy',
-                'Local Emergency Room',
-                'Urgent Care Center'
-            ]
-        }
+    def _scan_document(self, raw_text: str) -> _DocumentScan:
+        """Lowercase the document and collect its phone numbers and doctor names in one place."""
+        return _DocumentScan(
+            text_lower=raw_text.lower(),
+            phone_numbers=_PHONE_RE.findall(raw_text),
+            doctors=_DOCTOR_RE.findall(raw_text)
+        )
     
-    async def _extract_medications(self, raw_text: str, simplified_terms: List[Dict[str, str]]) -> List[MedicationInfo]:
-        """Extract medication information from the document."""
+    async def _extract_medications(self, scan: _DocumentScan, medication_terms: List[ExplainedTerm]) -> List[MedicationInfo]:
+        """Extract medication information for the document's medication terms."""
         medications = []
         
+        medication_keys = [term.key for term in medication_terms]
+        
         # Extract medications from simplified terms
-        for term in simplified_terms:
-            if term.get('category') == 'medication':
-                medication_name = term['term']
-                
-                # Try to extract dosage and frequency from raw text
-                dosage, frequency, instructions = self._extract_medication_details(raw_text, medication_name)
+        for term in medication_terms:
+            medication_name = term.term
+            med_lower = term.key
+            
+            # Try to extract dosage, frequency and supply details from the lines mentioning it
+            dosage, frequency, instructions, quantity, refills = self._extract_all_details(
+                self._iter_medication_lines(scan.text_lower, med_lower),
+                self._find_window_details(scan.text_lower, med_lower, medication_keys)
+            )
                 
-                medication = MedicationInfo(
-                    name=medication_name,
-                    dosage=dosage,
-                    frequency=frequency,
-                    instructions=instructions,
-                    quantity=self._extract_quantity(raw_text, medication_name),
-                    refills=self._extract_refills(raw_text, medication_name)
-                )
-                medications.append(medication)
+            medication = MedicationInfo(
+                name=medication_name,
+                dosage=dosage,
+                frequency=frequency,
+                instructions=instructions,
+                quantity=quantity,
+                refills=refills
+            )
+            medications.append(medication)
         
         return medications
     
-    def _extract_medication_details(self, text: str, medication_name: str) -> tuple:
-        """Extract dosage, frequency, and instructions for a medication."""
-        text_lower = text.lower()
-        med_lower = medication_name.lower()
+    def _iter_medication_lines(self, text_lower: str, med_lower: str) -> Iterator[str]:
+        """
+        Yield each line of the lowercased document that mentions a medication.
         
-        # Look for dosage patterns
+        The name is located with str.find and only the surrounding line is sliced out,
+        so lines that don't mention the medication are never materialized.
+        """
+        position = text_lower.find(med_lower)
+        while position != -1:
+            line_start = text_lower.rfind('\n', 0, position) + 1
+            line_end = text_lower.find('\n', position)
+            if line_end == -1:
+                yield text_lower[line_start:]
+                return
+            
+            yield text_lower[line_start:line_end]
+            position = text_lower.find(med_lower, line_end + 1)
+    
+    def _find_window_details(self, text_lower: str, med_lower: str,
+                             medication_keys: Iterable[str]) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+        """
+        Look for dosage, quantity and refills at the first mention of a medication.
+        
+        The window starts at the medication name itself, since names like "aspirin 81 mg"
+        end in their own dose. It is bounded to a short span on the same line and stops at
+        the next mention of another medication, so details that belong to medications
+        listed later in the document are not picked up.
+        
+        Returns:
+            Tuple of (dosage, quantity, refills), with None for anything not found
+        """
+        position = text_lower.find(med_lower)
+        if position == -1:
+            return None, None, None
+        
+        name_end = position + len(med_lower)
+        end = name_end + _DETAIL_WINDOW
+        line_end = text_lower.find('\n', name_end, end)
+        if line_end != -1:
+            end = line_end
+        for other_key in medication_keys:
+            if other_key != med_lower:
+                next_mention = text_lower.find(other_key, name_end, end)
+                if next_mention != -1:
+                    end = next_mention
+        
+        dosage_match = _DOSAGE_RE.search(text_lower, position, end)
+        qty_match = _QTY_RE.search(text_lower, position, end)
+        refill_match = _REFILL_RE.search(text_lower, position, end)
+        
+        return (
+            dosage_match.group(1).upper() if dosage_match else None,
+            int(qty_match.group(1)) if qty_match else None,
+            int(refill_match.group(1)) if refill_match else None
+        )
+    
+    def _extract_all_details(self, medication_lines: Iterable[str],
+                             window_details: Tuple[Optional[str], Optional[int], Optional[int]]
+                             ) -> Tuple[str, str, str, int, int]:
+        """
+        Extract dosage, frequency, instructions, quantity and refills for a medication.
+        
+        Every field is collected in a single pass over the lines mentioning the medication.
+        Details found right after the medication name (see _find_window_details) take
+        precedence over the line-wide matches.
+        """
         dosage = "As prescribed"
         frequency = "As directed"
         instructions = "Take as directed by your doctor"
+        window_dosage, quantity, refills = window_details
         
-        # Find lines containing the medication
-        lines = text.split('\n')
-        for line in lines:
-            if med_lower in line.lower():
-                line_lower = line.lower()
-                
-                # Extract dosage (look for numbers with mg, etc.)
-                import re
-                dosage_match = re.search(r'(\d+\s*mg)', line_lower)
-                if dosage_match:
-                    dosage = dosage_match.group(1).upper()
-                
-                # Extract frequency
-                if 'daily' in line_lower or 'every day' in line_lower:
-                    frequency = "Once daily"
-                elif 'twice' in line_lower or '2 times' in line_lower:
-                    frequency = "Twice daily"
-                elif 'three times' in line_lower or '3 times' in line_lower:
-                    frequency = "Three times daily"
-                
-                # Extract instructions
-                if 'mouth' in line_lower:
-                    instructions = "Take by mouth"
-                if 'food' in line_lower:
-                    instructions += " with food"
-                if 'water' in line_lower:
-                    instructions += " with water"
-        
-        return dosage, frequency, instructions
-    
-    def _extract_quantity(self, text: str, medication_name: str) -> int:
-        """Extract quantity for a medication."""
-        import re
-        text_lower = text.lower()
-        med_lower = medication_name.lower()
-        
-        # Look for quantity patterns
-        lines = text.split('\n')
-        for line in lines:
-            if med_lower in line.lower() and 'qty' in line.lower():
-                qty_match = re.search(r'qty:\s*(\d+)', line.lower())
-                if qty_match:
-                    return int(qty_match.group(1))
-        
-        return 30  # Default quantity
-    
-    def _extract_refills(self, text: str, medication_name: str) -> int:
-        """Extract number of refills for a medication."""
-        import re
-        text_lower = text.lower()
-        med_lower = medication_name.lower()
-        
-        # Look for refill patterns
-        lines = text.split('\n')
-        for line in lines:
-            if med_lower in line.lower() and 'refill' in line.lower():
-                refill_match = re.search(r'refill[s]?:\s*(\d+)', line.lower())
-                if refill_match:
-                    return int(refill_match.group(1))
-        
-        return 0  # Default no refills
+        for line_lower in medication_lines:
+            line_dosage, frequency_flags, instruction_flags, line_quantity, line_refills = _scan_line(line_lower)
+            
+            # Extract dosage (look for numbers with mg, etc.)
+            if line_dosage:
+                dosage = line_dosage
+            
+            # Extract frequency
+            if frequency_flags & 1:
+                frequency = "Once daily"
+            elif frequency_flags & 2:
+                frequency = "Twice daily"
+            elif frequency_flags & 4:
+                frequency = "Three times daily"
+            
+            # Extract instructions
+            if instruction_flags & 1:
+                instructions = "Take by mouth"
+            if instruction_flags & 2:
+                instructions += " with food"
+            if instruction_flags & 4:
+                instructions += " with water"
+            
+            # Quantity and refills come from the first line that states them
+            if quantity is None:
+                quantity = line_quantity
+            if refills is None:
+                refills = line_refills
+        
+        if window_dosage:
+            dosage = window_dosage
+        
+        return (
+            dosage,
+            frequency,
+            instructions,
+            30 if quantity is None else quantity,  # Default quantity
+            0 if refills is None else refills  # Default no refills
+        )
     
     async def _generate_action_items(self, raw_text: str, document_type: str, medications: List[MedicationInfo]) -> List[ActionItem]:
         """Generate action items based on the document content."""
@@ -238,108 +461,24 @@ class PlannerAgent(BaseAgent):
                 completed=False
             ))
         
-        # Document-specific action items
-        if document_type == 'prescription':
-            action_items.extend([
-                ActionItem(
-                    title="Pick up prescription",
-                    description="Go to the pharmacy to pick up your prescription",
-                    priority="high",
-                    timeframe="As soon as possible",
-                    completed=False
-                ),
-                ActionItem(
-                    title="Set up medication reminders",
-                    description="Set up phone reminders for your medication schedule",
-                    priority="medium",
-                    timeframe="Today",
-                    completed=False
-                )
-            ])
-        
-        elif document_type == 'discharge_summary':
-            action_items.extend([
-                ActionItem(
-                    title="Schedule follow-up appointment",
-                    description="Call your doctor to schedule the recommended follow-up appointment",
-                    priority="high",
-                    timeframe="Within 1 week",
-                    completed=False
-                ),
-                ActionItem(
-                    title="Review discharge instructions",
-                    description="Read through all discharge instructions carefully",
-                    priority="high",
-                    timeframe="Today",
-                    completed=False
-                )
-            ])
-        
-        elif document_type == 'lab_results':
-            action_items.extend([
-                ActionItem(
-                    title="Discuss results with doctor",
-                    description="Schedule an appointment to discuss your lab results",
-                    priority="high",
-                    timeframe="Within 2 weeks",
-                    completed=False
-                ),
-                ActionItem(
-                    title="Implement lifestyle changes",
-                    description="Start any recommended lifestyle changes based on your results",
-                    priority="medium",
-                    timeframe="This week",
-                    completed=False
-                )
-            ])
+        # Document-specific action items, copied from the shared templates so callers can update them
+        action_items.extend(item.model_copy() for item in _DOCUMENT_ACTION_ITEMS.get(document_type, ()))
         
         # Add general action items
-        action_items.extend([
-            ActionItem(
-                title="Keep medical records organized",
-                description="File this document with your other medical records",
-                priority="low",
-                timeframe="This week",
-                completed=False
-            ),
-            ActionItem(
-                title="Update emergency contacts",
-                description="Make sure your emergency contacts have your current medical information",
-                priority="medium",
-                timeframe="This month",
-                completed=False
-            )
-        ])
+        action_items.extend(item.model_copy() for item in _GENERAL_ACTION_ITEMS)
         
         return action_items
     
-    async def _generate_lifestyle_tips(self, medications: List[MedicationInfo], simplified_terms: List[Dict[str, str]]) -> List[str]:
+    def _generate_lifestyle_tips(self, medications: List[MedicationInfo], condition_terms: List[ExplainedTerm]) -> List[str]:
         """Generate lifestyle tips based on conditions and medications."""
-        tips = []
-        
-        # Get tips based on conditions
-        conditions = [term['term'].lower() for term in simplified_terms if term.get('category') == 'condition']
-        
-        for condition in conditions:
-            if condition in self.lifestyle_tips_db:
-                tips.extend(self.lifestyle_tips_db[condition])
-        
-        # Add general tips
-        tips.extend(self.lifestyle_tips_db['general'])
+        conditions = frozenset(term.key for term in condition_terms)
+        medication_tags = frozenset(
+            tag for tag in (_classify_medication(medication.name.lower()) for medication in medications) if tag
+        )
         
-        # Add medication-specific tips
-        for medication in medications:
-            if 'blood pressure' in medication.name.lower() or 'lisinopril' in medication.name.lower():
-                tips.extend(self.lifestyle_tips_db['hypertension'])
-            elif 'diabetes' in medication.name.lower() or 'metformin' in medication.name.lower():
-                tips.extend(self.lifestyle_tips_db['diabetes'])
-            elif 'cholesterol' in medication.name.lower() or 'atorvastatin' in medication.name.lower():
-                tips.extend(self.lifestyle_tips_db['high_cholesterol'])
-        
-        # Remove duplicates and return
-        return list(set(tips))
+        return list(_compute_lifestyle_tips(conditions, medication_tags))
     
-    async def _generate_follow_up_instructions(self, document_type: str, medications: List[MedicationInfo]) -> List[str]:
+    def _generate_follow_up_instructions(self, document_type: str, medications: List[MedicationInfo]) -> List[str]:
         """Generate follow-up instructions."""
         instructions = []
         
@@ -377,47 +516,55 @@ class PlannerAgent(BaseAgent):
         
         return instructions
     
-    async def _generate_emergency_contacts(self, document_type: str, raw_text: str) -> List[str]:
+    def _generate_emergency_contacts(self, document_type: str, scan: _DocumentScan) -> List[str]:
         """Generate emergency contacts."""
-        contacts = []
+        contacts: List[str] = []
         
         # Add general emergency contacts
-        contacts.extend(self.emergency_contacts_db['general'])
+        contacts.extend(_EMERGENCY_CONTACTS_DB['general'])
         
-        # Try to extract specific contacts from the document
-        import re
-        
-        # Look for phone numbers
-        phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phone_numbers = re.findall(phone_pattern, raw_text)
-        
-        for phone in phone_numbers:
+        # Add the phone numbers and doctors found in the document
+        for phone in scan.phone_numbers:
             contacts.append(f"Phone: {phone}")
         
-        # Look for doctor names
-        doctor_pattern = r'Dr\.\s+[A-Z][a-z]+\s+[A-Z][a-z]+'
-        doctors = re.findall(doctor_pattern, raw_text)
-        
-        for doctor in doctors:
+        for doctor in scan.doctors:
             contacts.append(f"{doctor} - Your Doctor")
         
         # Add medical emergency contacts
-        contacts.extend(self.emergency_contacts_db['medical'])
+        contacts.extend(_EMERGENCY_CONTACTS_DB['medical'])
         
         return contacts
     
-    def _generate_daily_checklist(self, medications: List[MedicationInfo], action_items: List[ActionItem]) -> Dict[str, Any]:
-        """Generate a daily checklist."""
-        daily_tasks = []
+    def _build_medication_tasks(self, medications: List[MedicationInfo]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Build the medication tasks for the daily checklist and weekly schedule in one pass.
+        
+        Returns:
+            Tuple of (checklist tasks, schedule tasks)
+        """
+        checklist_tasks = []
+        schedule_tasks = []
         
-        # Add medication tasks
         for medication in medications:
-            daily_tasks.append({
+            checklist_tasks.append({
                 'task': f"Take {medication.name} ({medication.dosage})",
                 'time': "Morning" if "daily" in medication.frequency.lower() else "As directed",
                 'priority': 'high',
                 'completed': False
             })
+            schedule_tasks.append({
+                'task': f"Take {medication.name}",
+                'time': "Morning",
+                'type': 'medication'
+            })
+        
+        return checklist_tasks, schedule_tasks
+    
+    def _generate_daily_checklist(self, medication_tasks: List[Dict[str, Any]], action_items: List[ActionItem]) -> Dict[str, Any]:
+        """Generate a daily checklist."""
+        # Start from the medication tasks (new tasks, so never completed yet)
+        daily_tasks = list(medication_tasks)
+        completed_tasks = 0
         
         # Add high-priority action items
         for item in action_items:
@@ -428,51 +575,44 @@ class PlannerAgent(BaseAgent):
                     'priority': item.priority,
                     'completed': item.completed
                 })
+                if item.completed:
+                    completed_tasks += 1
         
         return {
             'date': datetime.now().strftime('%Y-%m-%d'),
             'tasks': daily_tasks,
             'total_tasks': len(daily_tasks),
-            'completed_tasks': sum(1 for task in daily_tasks if task['completed'])
+            'completed_tasks': completed_tasks
         }
     
-    def _generate_weekly_schedule(self, medications: List[MedicationInfo], action_items: List[ActionItem]) -> Dict[str, Any]:
+    def _generate_weekly_schedule(self, medication_tasks: List[Dict[str, Any]], action_items: List[ActionItem]) -> Dict[str, Any]:
         """Generate a weekly schedule."""
         week_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        weekly_schedule = {}
         
-        for day in week_days:
-            daily_tasks = []
-            
-            # Add medication tasks for each day
-            for medication in medications:
+        # Add medication tasks for each day
+        daily_tasks = list(medication_tasks)
+        
+        # Add other tasks
+        for item in action_items:
+            if item.priority in ['high', 'medium']:
                 daily_tasks.append({
-                    'task': f"Take {medication.name}",
-                    'time': "Morning",
-                    'type': 'medication'
+                    'task': item.title,
+                    'time': item.timeframe,
+                    'type': 'action'
                 })
-            
-            # Add other tasks
-            for item in action_items:
-                if item.priority in ['high', 'medium']:
-                    daily_tasks.append({
-                        'task': item.title,
-                        'time': item.timeframe,
-                        'type': 'action'
-                    })
-            
-            weekly_schedule[day] = daily_tasks
         
-        return weekly_schedule
+        # Every day gets the same tasks; copy them so days can be updated independently
+        return {day: [dict(task) for task in daily_tasks] for day in week_days}
     
     def _assign_priority_levels(self, action_items: List[ActionItem]) -> Dict[str, int]:
         """Assign priority levels to action items."""
-        priority_counts = {'high': 0, 'medium': 0, 'low': 0}
-        
-        for item in action_items:
-            priority_counts[item.priority] += 1
+        priority_counts = Counter(item.priority for item in action_items)
         
-        return priority_counts
+        return {
+            'high': priority_counts['high'],
+            'medium': priority_counts['medium'],
+            'low': priority_counts['low']
+        }
     
     def _generate_completion_tracking(self, action_items: List[ActionItem]) -> Dict[str, Any]:
         """Generate completion tracking information."""
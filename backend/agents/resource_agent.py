@@ -2,25 +2,199 @@
 Resource Agent - Finds cost-saving resources and support information.
 """
 import asyncio
-from typing import Dict, Any, List
+from collections.abc import Mapping
+from functools import lru_cache
+from math import fsum
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple
 from agents.base_agent import BaseAgent
+from config import get_settings
+from models import ExplainedTerm
 from utils.logger import logger
 
+# Medication cost savings by lowercase medication name
+_COST_SAVINGS_DB: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    'lisinopril': {
+        'generic_available': True,
+        'generic_name': 'Lisinopril',
+        'brand_names': ['Prinivil', 'Zestril'],
+        'average_generic_cost': 15.00,
+        'average_brand_cost': 45.00,
+        'monthly_savings': 30.00,
+        'annual_savings': 360.00,
+        'discount_programs': [
+            'GoodRx',
+            'SingleCare',
+            'RxSaver'
+        ],
+        'manufacturer_coupons': True,
+        'patient_assistance': True
+    },
+    'metformin': {
+        'generic_available': True,
+        'generic_name': 'Metformin',
+        'brand_names': ['Glucophage'],
+        'average_generic_cost': 8.00,
+        'average_brand_cost': 25.00,
+        'monthly_savings': 17.00,
+        'annual_savings': 204.00,
+        'discount_programs': [
+            'GoodRx',
+            'SingleCare',
+            'RxSaver'
+        ],
+        'manufacturer_coupons': False,
+        'patient_assistance': True
+    },
+    'atorvastatin': {
+        'generic_available': True,
+        'generic_name': 'Atorvastatin',
+        'brand_names': ['Lipitor'],
+        'average_generic_cost': 20.00,
+        'average_brand_cost': 80.00,
+        'monthly_savings': 60.00,
+        'annual_savings': 720.00,
+        'discount_programs': [
+            'GoodRx',
+            'SingleCare',
+            'RxSaver'
+        ],
+        'manufacturer_coupons': True,
+        'patient_assistance': True
+    }
+})
+
+# Support resources by topic
+_SUPPORT_RESOURCES: Mapping[str, List[Dict[str, str]]] = MappingProxyType({
+    'general': [
+        {
+            'name': 'Medicare.gov',
+            'description': 'Official Medicare website with information about coverage and benefits',
+            'url': 'https://www.medicare.gov',
+            'phone': '1-800-MEDICARE',
+            'type': 'government'
+        },
+        {
+            'name': 'Healthcare.gov',
+            'description': 'Health insurance marketplace and coverage information',
+            'url': 'https://www.healthcare.gov',
+            'phone': '1-800-318-2596',
+            'type': 'government'
+        },
+        {
+            'name': 'Patient Advocate Foundation',
+            'description': 'Free case management and financial assistance for patients',
+            'url': 'https://www.patientadvocate.org',
+            'phone': '1-800-532-5274',
+            'type': 'nonprofit'
+        }
+    ],
+    'diabetes': [
+        {
+            'name': 'American Diabetes Association',
+            'description': 'Resources, education, and support for diabetes management',
+            'url': 'https://www.diabetes.org',
+            'phone': '1-800-DIABETES',
+            'type': 'nonprofit'
+        },
+        {
+            'name': 'Diabetes Self-Management Education',
+            'description': 'Classes and resources for diabetes self-care',
+            'url': 'https://www.diabeteseducator.org',
+            'phone': '1-800-338-3633',
+            'type': 'education'
+        }
+    ],
+    'hypertension': [
+        {
+            'name': 'American Heart Association',
+            'description': 'Resources for heart health and blood pressure management',
+            'url': 'https://www.heart.org',
+            'phone': '1-800-AHA-USA1',
+            'type': 'nonprofit'
+        },
+        {
+            'name': 'Blood Pressure Monitoring',
+            'description': 'Free blood pressure monitoring at many pharmacies',
+            'url': 'https://www.heart.org/en/health-topics/high-blood-pressure',
+            'phone': '1-800-AHA-USA1',
+            'type': 'service'
+        }
+    ]
+})
+
+# Terms that make condition-specific support resources relevant
+_DIABETES_TRIGGERS = frozenset({'metformin', 'glucose', 'diabetes'})
+_HYPERTENSION_TRIGGERS = frozenset({'lisinopril', 'atorvastatin', 'hypertension'})
+
+
+def _build_savings_tips(med_info: Mapping[str, Any]) -> Tuple[str, ...]:
+    """Build the cost-saving tips for a cost savings database entry."""
+    tips = []
+    
+    if med_info['generic_available']:
+        tips.append(f"Ask your doctor about generic {med_info['generic_name']} to save ${med_info['monthly_savings']:.2f} per month")
+    
+    if med_info['discount_programs']:
+        tips.append(f"Use discount programs like {', '.join(med_info['discount_programs'])} for additional savings")
+    
+    if med_info['manufacturer_coupons']:
+        tips.append("Check for manufacturer coupons on the drug company's website")
+    
+    if med_info['patient_assistance']:
+        tips.append("Ask your doctor about patient assistance programs if you're having trouble affording this medication")
+    
+    tips.append("Consider using a 90-day supply to reduce co-pays and pharmacy visits")
+    tips.append("Compare prices at different pharmacies - costs can vary significantly")
+    
+    return tuple(tips)
+
+
+# Tips only depend on the static database, so they are built once at import
+_SAVINGS_TIPS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    medication: _build_savings_tips(med_info) for medication, med_info in _COST_SAVINGS_DB.items()
+})
+
+
+@lru_cache(maxsize=64)
+def _cost_savings_for(medication: str) -> Mapping[str, Any]:
+    """
+    Build the read-only cost savings entry for a medication in the cost savings database.
+    
+    The entry only depends on the static database, so one instance is shared per medication.
+    """
+    med_info = _COST_SAVINGS_DB[medication]
+    return MappingProxyType({
+        'medication': medication.title(),
+        'generic_available': med_info['generic_available'],
+        'generic_name': med_info['generic_name'],
+        'brand_names': med_info['brand_names'],
+        'monthly_savings': med_info['monthly_savings'],
+        'annual_savings': med_info['annual_savings'],
+        'discount_programs': med_info['discount_programs'],
+        'manufacturer_coupons': med_info['manufacturer_coupons'],
+        'patient_assistance': med_info['patient_assistance'],
+        'savings_tips': _SAVINGS_TIPS[medication]
+    })
+
 
 class ResourceAgent(BaseAgent):
     """Agent responsible for finding cost-saving resources and support information."""
     
+    __slots__ = ('cost_savings_db', 'support_resources')
+    
     def __init__(self):
         super().__init__("Resource")
-        self.cost_savings_db = self._initialize_cost_savings_db()
-        self.support_resources = self._initialize_support_resources()
+        self.cost_savings_db = _COST_SAVINGS_DB
+        self.support_resources = _SUPPORT_RESOURCES
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Find cost-saving resources and support information.
         
         Args:
-            input_data: Dictionary containing 'simplified_terms' and 'document_type'
+            input_data: Dictionary containing 'simplified_terms' and 'document_type';
+                runs alongside PlannerAgent, so it must not depend on planner outputs
             
         Returns:
             Dictionary containing cost savings and resource information
@@ -28,19 +202,17 @@ class ResourceAgent(BaseAgent):
         simplified_terms = input_data.get('simplified_terms', [])
         document_type = input_data.get('document_type', 'unknown')
         
-        logger.info(f"Finding resources for {document_type} document")
+        logger.info("Finding resources for %s document", document_type)
         
         # Extract medications from simplified terms
         medications = self._extract_medications(simplified_terms)
         
-        # Find cost savings for medications
-        cost_savings = await self._find_medication_cost_savings(medications)
-        
-        # Find general support resources
-        support_resources = await self._find_support_resources(document_type, medications)
-        
-        # Generate insurance and financial assistance info
-        financial_assistance = await self._generate_financial_assistance_info(medications)
+        # Find cost savings, support resources and financial assistance info concurrently
+        cost_savings, support_resources, financial_assistance = await asyncio.gather(
+            self._find_medication_cost_savings(medications),
+            self._find_support_resources(document_type, medications),
+            self._generate_financial_assistance_info(medications)
+        )
         
         return {
             "cost_savings": cost_savings,
@@ -50,174 +222,26 @@ class ResourceAgent(BaseAgent):
             "total_potential_savings": self._calculate_total_savings(cost_savings)
         }
     
-    def _initialize_cost_savings_db(self) -> Dict[str, Dict[str, Any]]:
-        """Initialize database of medication cost savings."""
-        return {
-            'lisinopril': {
-                'generic_available': True,
-                'generic_name': 'Lisinopril',
-                'brand_names': ['Prinivil', 'Zestril'],
-                'average_generic_cost': 15.00,
-                'average_brand_cost': 45.00,
-                'monthly_savings': 30.00,
-                'annual_savings': 360.00,
-                'discount_programs': [
-                    'GoodRx',
-                    'SingleCare',
-                    'RxSaver'
-                ],
-                'manufacturer_coupons': True,
-                'patient_assistance': True
-            },
-            'metformin': {
-                'generic_available': True,
-                'generic_name': 'Metformin',
-                'brand_names': ['Glucophage'],
-                'average_generic_cost': 8.00,
-                'average_brand_cost': 25.00,
-                'monthly_savings': 17.00,
-                'annual_savings': 204.00,
-                'discount_programs': [
-                    'GoodRx',
-                    'SingleCare',
-                    'RxSaver'
-                ],
-                'manufacturer_coupons': False,
-                'patient_assistance': True
-            },
-            'atorvastatin': {
-                'generic_available': True,
-                'generic_name': 'Atorvastatin',
-                'brand_names': ['Lipitor'],
-                'average_generic_cost': 20.00,
-                'average_brand_cost': 80.00,
-                'monthly_savings': 60.00,
-                'annual_savings': 720.00,
-                'discount_programs': [
-                    'GoodRx',
-                    'SingleCare',
-                    'RxSaver'
-                ],
-                'manufacturer_coupons': True,
-                'patient_assistance': True
-            }
-        }
-    
-    def _initialize_support_resources(self) -> Dict[str, List[Dict[str, str]]]:
-        """Initialize support resources database."""
-        return {
-            'general': [
-                {
-                    'name': 'Medicare.gov',
-                    'description': 'Official Medicare website with information about coverage and benefits',
-                    'url': 'https://www.medicare.gov',
-                    'phone': '1-800-MEDICARE',
-                    'type': 'government'
-                },
-                {
-                    'name': 'Healthcare.gov',
-                    'description': 'Health insurance marketplace and coverage information',
-                    'url': 'https://www.healthcare.gov',
-                    'phone': '1-800-318-2596',
-                    'type': 'government'
-                },
-                {
-                    'name': 'Patient Advocate Foundation',
-                    'description': 'Free case management and financial assistance for patients',
-                    'url': 'https://www.patientadvocate.org',
-                    'phone': '1-800-532-5274',
-                    'type': 'nonprofit'
-                }
-            ],
-            'diabetes': [
-                {
-                    'name': 'American Diabetes Association',
-                    'description': 'Resources, education, and support for diabetes management',
-                    'url': 'https://www.diabetes.org',
-                    'phone': '1-800-DIABETES',
-                    'type': 'nonprofit'
-                },
-                {
-                    'name': 'Diabetes Self-Management Education',
-                    'description': 'Classes and resources for diabetes self-care',
-                    'url': 'https://www.diabeteseducator.org',
-                    'phone': '1-800-338-3633',
-                    'type': 'education'
-                }
-            ],
-            'hypertension': [
-                {
-                    'name': 'American Heart Association',
-                    'description': 'Resources for heart health and blood pressure management',
-                    'url': 'https://www.heart.org',
-                    'phone': '1-800-AHA-USA1',
-                    'type': 'nonprofit'
-                },
-                {
-                    'name': 'Blood Pressure Monitoring',
-                    'description': 'Free blood pressure monitoring at many pharmacies',
-                    'url': 'https://www.heart.org/en/health-topics/high-blood-pressure',
-                    'phone': '1-800-AHA-USA1',
-                    'type': 'service'
-                }
-            ]
-        }
+    def _extract_medications(self, simplified_terms: List[ExplainedTerm]) -> List[str]:
+        """Extract unique medication names from simplified terms, in first-seen order."""
+        return list(dict.fromkeys(
+            term.key for term in simplified_terms if term.category == 'medication'
+        ))
     
-    def _extract_medications(self, simplified_terms: List[Dict[str, str]]) -> List[str]:
-        """Extract medication names from simplified terms."""
-        medications = []
-        for term in simplified_terms:
-            if term.get('category') == 'medication':
-                medications.append(term['term'].lower())
-        return medications
-    
-    async def _find_medication_cost_savings(self, medications: List[str]) -> List[Dict[str, Any]]:
+    async def _find_medication_cost_savings(self, medications: List[str]) -> List[Mapping[str, Any]]:
         """Find cost savings for medications."""
         cost_savings = []
         
         for medication in medications:
             if medication in self.cost_savings_db:
-                med_info = self.cost_savings_db[medication]
-                
                 # Simulate API call delay
-                await asyncio.sleep(0.2)
+                if get_settings().simulate_latency:
+                    await asyncio.sleep(0.2)
                 
-                cost_savings.append({
-                    'medication': medication.title(),
-                    'generic_available': med_info['generic_available'],
-                    'generic_name': med_info['generic_name'],
-                    'brand_names': med_info['brand_names'],
-                    'monthly_savings': med_info['monthly_savings'],
-                    'annual_savings': med_info['annual_savings'],
-                    'discount_programs': med_info['discount_programs'],
-                    'manufacturer_coupons': med_info['manufacturer_coupons'],
-                    'patient_assistance': med_info['patient_assistance'],
-                    'savings_tips': self._generate_savings_tips(med_info)
-                })
+                cost_savings.append(_cost_savings_for(medication))
         
         return cost_savings
     
-    def _generate_savings_tips(self, med_info: Dict[str, Any]) -> List[str]:
-        """Generate cost-saving tips for medications."""
-        tips = []
-        
-        if med_info['generic_available']:
-            tips.append(f"Ask your doctor about generic {med_info['generic_name']} to save ${med_info['monthly_savings']:.2f} per month")
-        
-        if med_info['discount_programs']:
-            tips.append(f"Use discount programs like {', '.join(med_info['discount_programs'])} for additional savings")
-        
-        if med_info['manufacturer_coupons']:
-            tips.append("Check for manufacturer coupons on the drug company's website")
-        
-        if med_info['patient_assistance']:
-            tips.append("Ask your doctor about patient assistance programs if you're having trouble affording this medication")
-        
-        tips.append("Consider using a 90-day supply to reduce co-pays and pharmacy visits")
-        tips.append("Compare prices at different pharmacies - costs can vary significantly")
-        
-        return tips
-    
     async def _find_support_resources(self, document_type: str, medications: List[str]) -> List[Dict[str, str]]:
         """Find relevant support resources."""
         resources = []
@@ -226,21 +250,24 @@ class ResourceAgent(BaseAgent):
         resources.extend(self.support_resources['general'])
         
         # Add condition-specific resources based on medications
-        if any(med in ['metformin', 'glucose', 'diabetes'] for med in medications):
+        medication_set = frozenset(medications)
+        if not _DIABETES_TRIGGERS.isdisjoint(medication_set):
             resources.extend(self.support_resources['diabetes'])
         
-        if any(med in ['lisinopril', 'atorvastatin', 'hypertension'] for med in medications):
+        if not _HYPERTENSION_TRIGGERS.isdisjoint(medication_set):
             resources.extend(self.support_resources['hypertension'])
         
         # Simulate API call delay
-        await asyncio.sleep(0.3)
+        if get_settings().simulate_latency:
+            await asyncio.sleep(0.3)
         
         return resources
     
     async def _generate_financial_assistance_info(self, medications: List[str]) -> Dict[str, Any]:
         """Generate financial assistance information."""
         # Simulate API call delay
-        await asyncio.sleep(0.2)
+        if get_settings().simulate_latency:
+            await asyncio.sleep(0.2)
         
         return {
             'medicare_part_d': {
@@ -268,9 +295,6 @@ class ResourceAgent(BaseAgent):
             }
         }
     
-    def _calculate_total_savings(self, cost_savings: List[Dict[str, Any]]) -> float:
+    def _calculate_total_savings(self, cost_savings: List[Mapping[str, Any]]) -> float:
         """Calculate total potential annual savings."""
-        total = 0.0
-        for savings in cost_savings:
-            total += savings.get('annual_savings', 0.0)
-        return total
+        return fsum(savings.get('annual_savings', 0.0) for savings in cost_savings)
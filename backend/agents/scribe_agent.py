@@ -3,89 +3,48 @@ Scribe Agent - Extracts text from medical document images using OCR.
 """
 import asyncio
 import io
-from typing import Dict, Any
-from PIL import Image
+import os
+import re
+from typing import Dict, Any, BinaryIO, List, Tuple, Union
 from agents.base_agent import BaseAgent
+from agents.translator_agent import KNOWN_TERMS
 from utils.logger import logger
 
+# Document-type keywords
+_DOCTYPE_BY_KEYWORD = {
+    'rx#': 'prescription',
+    'prescription': 'prescription',
+    'pharmacy': 'prescription',
+    'refills': 'prescription',
+    'discharge': 'discharge_summary',
+    'admission': 'discharge_summary',
+    'follow-up': 'discharge_summary',
+    'lab': 'lab_results',
+    'glucose': 'lab_results',
+    'cholesterol': 'lab_results',
+    'reference ranges': 'lab_results'
+}
 
-class ScribeAgent(BaseAgent):
-    """Agent responsible for extracting text from medical document images."""
-    
-    def __init__(self):
-        super().__init__("Scribe")
-        self.supported_formats = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp']
-    
-    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Extract text from medical document image.
-        
-        Args:
-            input_data: Dictionary containing 'image_content' and 'filename'
-            
-        Returns:
-            Dictionary containing extracted text and metadata
-        """
-        image_content = input_data.get('image_content')
-        filename = input_data.get('filename', 'unknown')
-        
-        if not image_content:
-            raise ValueError("No image content provided")
-        
-        logger.info(f"Extracting text from {filename}")
-        
-        # For now, we'll use mock OCR since Google Vision API is not available
-        # In production, this would integrate with Google Vision API
-        extracted_text = await self._mock_ocr_extraction(image_content, filename)
-        
-        # Basic text cleaning and validation
-        cleaned_text = self._clean_extracted_text(extracted_text)
-        
-        # Detect document type based on content
-        document_type = self._detect_document_type(cleaned_text)
-        
-        return {
-            "raw_text": cleaned_text,
-            "document_type": document_type,
-            "confidence_score": 0.95,  # Mock confidence score
-            "extraction_metadata": {
-                "filename": filename,
-                "file_size": len(image_content),
-                "text_length": len(cleaned_text),
-                "processing_method": "mock_ocr"
-            }
-        }
-    
-    async def _mock_ocr_extraction(self, image_content: bytes, filename: str) -> str:
-        """
-        Mock OCR extraction - simulates Google Vision API.
-        
-        In production, this would be replaced with actual Google Vision API calls.
-        """
-        # Simulate processing delay
-        await asyncio.sleep(1.0)
-        
-        # Validate image
-        try:
-            image_stream = io.BytesIO(image_content)
-            image = Image.open(image_stream)
-            image.verify()
-        except Exception as e:
-            logger.warning(f"Image validation failed: {e}")
-        
-        # Return mock extracted text based on filename or content
-        if 'prescription' in filename.lower():
-            return self._get_mock_prescription_text()
-        elif 'discharge' in filename.lower():
-            return self._get_mock_discharge_text()
-        elif 'lab' in filename.lower():
-            return self._get_mock_lab_text()
-        else:
-            return self._get_mock_prescription_text()  # Default to prescription
-    
-    def _get_mock_prescription_text(self) -> str:
-        """Return mock prescription text."""
-        return """YOUR PHARMACY
+# Document-type keywords and known medical terms in one alternation. The lookahead tries
+# every start position, so keywords that overlap at different positions are all reported.
+# At a single position only the first matching alternative is reported, so the alternation
+# is ordered longest-first; a keyword that is a prefix of a longer one would be missed where
+# the longer one occurs (none of the current keywords is a prefix of another)
+_SCAN_RE = re.compile(
+    '(?=(' + '|'.join(
+        re.escape(keyword) for keyword in sorted(_DOCTYPE_BY_KEYWORD.keys() | KNOWN_TERMS, key=len, reverse=True)
+    ) + '))',
+    re.IGNORECASE,
+)
+
+# Detection order when keywords of several types appear in one document
+_DOCTYPE_PRIORITY = ('prescription', 'discharge_summary', 'lab_results')
+
+# Runs of whitespace collapsed when cleaning OCR text
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Mock prescription text
+_MOCK_PRESCRIPTION_TEXT = """YOUR PHARMACY
 123 Healthy Street
 City, State 12345
 Phone: (555) 123-4567
@@ -113,10 +72,9 @@ Pharmacy Notes:
 - Monitor blood pressure regularly
 - Contact doctor if side effects persist
 """
-    
-    def _get_mock_discharge_text(self) -> str:
-        """Return mock discharge summary text."""
-        return """DISCHARGE SUMMARY
+
+# Mock discharge summary text
+_MOCK_DISCHARGE_TEXT = """DISCHARGE SUMMARY
 
 Patient: JOHN DOE
 DOB: 01/15/1950
@@ -144,10 +102,9 @@ EMERGENCY CONTACTS:
 - Dr. Smith: (555) 123-4567
 - Emergency: 911
 """
-    
-    def _get_mock_lab_text(self) -> str:
-        """Return mock lab results text."""
-        return """LABORATORY RESULTS
+
+# Mock lab results text
+_MOCK_LAB_TEXT = """LABORATORY RESULTS
 
 Patient: JOHN DOE
 DOB: 01/15/1950
@@ -175,31 +132,181 @@ Cholesterol: <200 mg/dL
 LDL: <100 mg/dL
 A1C: <7.0%
 """
+
+# Filename keyword -> mock text, checked in order
+_MOCK_TEXT_BY_KEYWORD = {
+    'prescription': _MOCK_PRESCRIPTION_TEXT,
+    'discharge': _MOCK_DISCHARGE_TEXT,
+    'lab': _MOCK_LAB_TEXT
+}
+
+# Image inputs PIL can open directly: raw bytes, a binary stream or a file path
+ImageSource = Union[bytes, BinaryIO, str, os.PathLike]
+
+
+def _check_image(source: Union[BinaryIO, str, os.PathLike]) -> bool:
+    """Open and verify an image with PIL, logging a warning if it does not decode."""
+    # Pillow is heavy to import, so load it on first verification rather than at startup
+    from PIL import Image
     
-    def _clean_extracted_text(self, text: str) -> str:
-        """Clean and normalize extracted text."""
-        # Remove excessive whitespace
-        lines = [line.strip() for line in text.split('\n')]
-        lines = [line for line in lines if line]  # Remove empty lines
+    try:
+        Image.open(source).verify()
+        return True
+    except Exception as e:
+        logger.warning("Image validation failed: %s", e)
+        return False
+    finally:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+
+
+def _image_size(image_content: ImageSource) -> int:
+    """Return the size in bytes of raw image bytes, a seekable stream or a file path."""
+    if isinstance(image_content, bytes):
+        return len(image_content)
+    if isinstance(image_content, (str, os.PathLike)):
+        return os.path.getsize(image_content)
+    
+    size = image_content.seek(0, os.SEEK_END)
+    image_content.seek(0)
+    return size
+
+
+def _verify_image(image_content: ImageSource) -> bool:
+    """
+    Check that an image decodes.
+    
+    Args:
+        image_content: Raw image bytes, a binary stream or a file path
         
-        # Join lines with single newlines
-        cleaned_text = '\n'.join(lines)
+    Returns:
+        True if PIL could verify the image
+    """
+    # Paths and open streams go straight to PIL without buffering them first.
+    # BytesIO shares the bytes object's buffer until written, so this does not copy the upload
+    source = io.BytesIO(image_content) if isinstance(image_content, bytes) else image_content
+    return _check_image(source)
+
+
+def _classify_text(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Scan cleaned text once for document-type keywords and known medical terms.
+    
+    Returns:
+        Tuple of (document type, sorted lowercase known terms found)
+    """
+    found_types = set()
+    found_terms = set()
+    
+    for keyword in _SCAN_RE.findall(text):
+        keyword = keyword.lower()
+        document_type = _DOCTYPE_BY_KEYWORD.get(keyword)
+        if document_type:
+            found_types.add(document_type)
+        if keyword in KNOWN_TERMS:
+            found_terms.add(keyword)
+    
+    terms = tuple(sorted(found_terms))
+    for document_type in _DOCTYPE_PRIORITY:
+        if document_type in found_types:
+            return document_type, terms
+    return 'unknown', terms
+
+
+class ScribeAgent(BaseAgent):
+    """Agent responsible for extracting text from medical document images."""
+    
+    __slots__ = ('supported_formats',)
+    
+    def __init__(self):
+        super().__init__("Scribe")
+        self.supported_formats = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp']
+    
+    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract text from medical document image.
         
-        # Basic text normalization
-        cleaned_text = cleaned_text.replace('\t', ' ')
-        cleaned_text = ' '.join(cleaned_text.split())  # Normalize spaces
+        Args:
+            input_data: Dictionary containing 'image_content' and 'filename', plus the
+                optional 'image_validated' flag set once the document processor checked the image
+            
+        Returns:
+            Dictionary containing extracted text and metadata
+        """
+        image_content = input_data.get('image_content')
+        filename = input_data.get('filename', 'unknown')
         
-        return cleaned_text
+        if not image_content:
+            raise ValueError("No image content provided")
+        
+        logger.info("Extracting text from %s", filename)
+        
+        # For now, we'll use mock OCR since Google Vision API is not available
+        # In production, this would integrate with Google Vision API
+        extracted_text = await self._mock_ocr_extraction(
+            image_content, filename, already_validated=input_data.get('image_validated', False)
+        )
+        
+        # Basic text cleaning and validation
+        cleaned_text = self._clean_extracted_text(extracted_text)
+        
+        # Detect document type and collect known medical terms in one pass over the text
+        document_type, preliminary_terms = self._classify_and_scan(cleaned_text)
+        
+        return {
+            "raw_text": cleaned_text,
+            "document_type": document_type,
+            "preliminary_terms": preliminary_terms,
+            "confidence_score": 0.95,  # Mock confidence score
+            "extraction_metadata": {
+                "filename": filename,
+                "file_size": _image_size(image_content),
+                "text_length": len(cleaned_text),
+                "processing_method": "mock_ocr"
+            }
+        }
+    
+    async def _mock_ocr_extraction(self, image_content: ImageSource, filename: str,
+                                   already_validated: bool = False) -> str:
+        """
+        Mock OCR extraction - simulates Google Vision API.
+        
+        In production, this would be replaced with actual Google Vision API calls.
+        
+        Args:
+            image_content: Raw image bytes, a binary stream or a file path
+            filename: Name of the uploaded file
+            already_validated: Whether the caller already checked the image with PIL
+        """
+        # Simulate processing delay
+        await asyncio.sleep(1.0)
+        
+        # Validate image unless the document processor already checked it; verify()
+        # decodes the whole file, so keep it off the event loop
+        if not already_validated:
+            await asyncio.to_thread(_verify_image, image_content)
+        
+        # Return mock extracted text based on filename or content
+        filename_lower = filename.lower()
+        for keyword, mock_text in _MOCK_TEXT_BY_KEYWORD.items():
+            if keyword in filename_lower:
+                return mock_text
+        return _MOCK_PRESCRIPTION_TEXT  # Default to prescription
     
-    def _detect_document_type(self, text: str) -> str:
-        """Detect document type based on content."""
-        text_lower = text.lower()
+    def _clean_extracted_text(self, text: str) -> str:
+        """Clean and normalize extracted text."""
+        # Collapse every whitespace run (newlines and tabs included) to a single space
+        return _WHITESPACE_RE.sub(' ', text).strip()
+    
+    def _classify_and_scan(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Detect the document type and find known medical terms in a single scan.
         
-        if any(keyword in text_lower for keyword in ['rx#', 'prescription', 'pharmacy', 'refills']):
-            return 'prescription'
-        elif any(keyword in text_lower for keyword in ['discharge', 'admission', 'follow-up']):
-            return 'discharge_summary'
-        elif any(keyword in text_lower for keyword in ['lab', 'glucose', 'cholesterol', 'reference ranges']):
-            return 'lab_results'
-        else:
-            return 'unknown'
+        Args:
+            text: Cleaned document text
+            
+        Returns:
+            Tuple of (document type, sorted lowercase known terms found)
+        """
+        document_type, found_terms = _classify_text(text)
+        return document_type, list(found_terms)
@@ -2,17 +2,95 @@
 Translator Agent - Explains medical terms using AI language models.
 """
 import asyncio
-from typing import Dict, Any, List
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Optional
 from agents.base_agent import BaseAgent
+from models import ExplainedTerm
 from utils.logger import logger
 
+# Known medical terms with plain-language explanations
+_MEDICAL_TERMS_DB: Mapping[str, Dict[str, str]] = MappingProxyType({
+    'lisinopril': {
+        'explanation': 'A common and safe medication used to treat high blood pressure (hypertension). It works by relaxing your blood vessels, making it easier for your heart to pump blood around your body.',
+        'importance': 'Essential for controlling blood pressure and preventing heart problems like heart attacks and strokes.',
+        'category': 'medication'
+    },
+    'hypertension': {
+        'explanation': 'High blood pressure - a condition where the force of blood against your artery walls is consistently too high.',
+        'importance': 'Can lead to serious health problems if not controlled, including heart disease, stroke, and kidney problems.',
+        'category': 'condition'
+    },
+    'diabetes': {
+        'explanation': 'A condition where your body has trouble controlling blood sugar levels. There are two main types: Type 1 and Type 2.',
+        'importance': 'Requires careful management to prevent complications like heart disease, kidney problems, and nerve damage.',
+        'category': 'condition'
+    },
+    'metformin': {
+        'explanation': 'A medication commonly used to treat Type 2 diabetes. It helps your body use insulin more effectively and reduces sugar production in the liver.',
+        'importance': 'Helps control blood sugar levels and can reduce the risk of diabetes complications.',
+        'category': 'medication'
+    },
+    'atorvastatin': {
+        'explanation': 'A medication that helps lower cholesterol levels in your blood. It belongs to a group of drugs called statins.',
+        'importance': 'Reduces the risk of heart disease and stroke by lowering "bad" cholesterol and increasing "good" cholesterol.',
+        'category': 'medication'
+    },
+    'glucose': {
+        'explanation': 'A type of sugar that your body uses for energy. It comes from the food you eat and is carried through your bloodstream.',
+        'importance': 'Your body needs glucose for energy, but too much can cause health problems, especially for people with diabetes.',
+        'category': 'lab_value'
+    },
+    'cholesterol': {
+        'explanation': 'A waxy substance found in your blood. Your body needs some cholesterol, but too much can clog your arteries.',
+        'importance': 'High cholesterol can lead to heart disease and stroke, so it\'s important to keep it at healthy levels.',
+        'category': 'lab_value'
+    },
+    'hdl': {
+        'explanation': 'High-Density Lipoprotein - often called "good" cholesterol. It helps remove other forms of cholesterol from your bloodstream.',
+        'importance': 'Higher HDL levels are better and can help protect against heart disease.',
+        'category': 'lab_value'
+    },
+    'ldl': {
+        'explanation': 'Low-Density Lipoprotein - often called "bad" cholesterol. It can build up in your arteries and cause blockages.',
+        'importance': 'Lower LDL levels are better. High LDL increases your risk of heart disease and stroke.',
+        'category': 'lab_value'
+    },
+    'hemoglobin a1c': {
+        'explanation': 'A blood test that shows your average blood sugar level over the past 2-3 months. It\'s also called HbA1c or A1C.',
+        'importance': 'This test helps doctors see how well your diabetes is being controlled over time.',
+        'category': 'lab_value'
+    }
+})
+
+# Known term keys; ScribeAgent also matches these in its document scan
+KNOWN_TERMS = frozenset(_MEDICAL_TERMS_DB)
+
+# Title-cased display names for known terms, so only unknown terms are cased per request
+_DISPLAY_NAMES: Mapping[str, str] = MappingProxyType({term: term.title() for term in _MEDICAL_TERMS_DB})
+
+# Known terms in one alternation; the lookahead also reports terms that overlap each other
+_KNOWN_TERMS_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(term) for term in sorted(_MEDICAL_TERMS_DB, key=len, reverse=True)) + '))',
+    re.IGNORECASE,
+)
+
+# Medication patterns (uppercase words, often with numbers)
+_MEDICATION_RE = re.compile(r'\b[A-Z][A-Z\s]+\d+\s*MG?\b')
+
+# Lab value patterns
+_LAB_VALUE_RE = re.compile(r'\b(glucose|cholesterol|hdl|ldl|creatinine|bun|sodium|potassium)\b', re.IGNORECASE)
+
 
 class TranslatorAgent(BaseAgent):
     """Agent responsible for translating medical jargon into plain language."""
     
+    __slots__ = ('medical_terms_db',)
+    
     def __init__(self):
         super().__init__("Translator")
-        self.medical_terms_db = self._initialize_medical_terms()
+        self.medical_terms_db = _MEDICAL_TERMS_DB
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -30,10 +108,10 @@ class TranslatorAgent(BaseAgent):
         if not raw_text:
             raise ValueError("No text provided for translation")
         
-        logger.info(f"Translating medical terms for {document_type} document")
+        logger.info("Translating medical terms for %s document", document_type)
         
-        # Extract medical terms from the text
-        medical_terms = self._extract_medical_terms(raw_text)
+        # Extract medical terms from the text, reusing known terms the scribe already found
+        medical_terms = self._extract_medical_terms(raw_text, input_data.get('preliminary_terms'))
         
         # Generate simplified explanations
         simplified_terms = await self._generate_explanations(medical_terms, document_type)
@@ -48,109 +126,48 @@ class TranslatorAgent(BaseAgent):
             "translation_confidence": 0.92  # Mock confidence score
         }
     
-    def _initialize_medical_terms(self) -> Dict[str, Dict[str, str]]:
-        """Initialize database of medical terms and their explanations."""
-        return {
-            'lisinopril': {
-                'explanation': 'A common and safe medication used to treat high blood pressure (hypertension). It works by relaxing your blood vessels, making it easier for your heart to pump blood around your body.',
-                'importance': 'Essential for controlling blood pressure and preventing heart problems like heart attacks and strokes.',
-                'category': 'medication'
-            },
-            'hypertension': {
-                'explanation': 'High blood pressure - a condition where the force of blood against your artery walls is consistently too high.',
-                'importance': 'Can lead to serious health problems if not controlled, including heart disease, stroke, and kidney problems.',
-                'category': 'condition'
-            },
-            'diabetes': {
-                'explanation': 'A condition where your body has trouble controlling blood sugar levels. There are two main types: Type 1 and Type 2.',
-                'importance': 'Requires careful management to prevent complications like heart disease, kidney problems, and nerve damage.',
-                'category': 'condition'
-            },
-            'metformin': {
-                'explanation': 'A medication commonly used to treat Type 2 diabetes. It helps your body use insulin more effectively and reduces sugar production in the liver.',
-                'importance': 'Helps control blood sugar levels and can reduce the risk of diabetes complications.',
-                'category': 'medication'
-            },
-            'atorvastatin': {
-                'explanation': 'A medication that helps lower cholesterol levels in your blood. It belongs to a group of drugs called statins.',
-                'importance': 'Reduces the risk of heart disease and stroke by lowering "bad" cholesterol and increasing "good" cholesterol.',
-                'category': 'medication'
-            },
-            'glucose': {
-                'explanation': 'A type of sugar that your body uses for energy. It comes from the food you eat and is carried through your bloodstream.',
-                'importance': 'Your body needs glucose for energy, but too much can cause health problems, especially for people with diabetes.',
-                'category': 'lab_value'
-            },
-            'cholesterol': {
-                'explanation': 'A waxy substance found in your blood. Your body needs some cholesterol, but too much can clog your arteries.',
-                'importance': 'High cholesterol can lead to heart disease and stroke, so it\'s important to keep it at healthy levels.',
-                'category': 'lab_value'
-            },
-            'hdl': {
-                'explanation': 'High-Density Lipoprotein - often called "good" cholesterol. It helps remove other forms of cholesterol from your bloodstream.',
-                'importance': 'Higher HDL levels are better and can help protect against heart disease.',
-                'category': 'lab_value'
-            },
-            'ldl': {
-                'explanation': 'Low-Density Lipoprotein - often called "bad" cholesterol. It can build up in your arteries and cause blockages.',
-                'importance': 'Lower LDL levels are better. High LDL increases your risk of heart disease and stroke.',
-                'category': 'lab_value'
-            },
-            'hemoglobin a1c': {
-                'explanation': 'A blood test that shows your average blood sugar level over the past 2-3 months. It\'s also called HbA1c or A1C.',
-                'importance': 'This test helps doctors see how well your diabetes is being controlled over time.',
-                'category': 'lab_value'
-            }
-        }
-    
-    def _extract_medical_terms(self, text: str) -> List[str]:
-        """Extract medical terms from the text."""
-        text_lower = text.lower()
-        found_terms = []
+    def _extract_medical_terms(self, text: str, preliminary_terms: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Extract medical terms from the text.
         
+        Args:
+            text: Document text
+            preliminary_terms: Known terms already found in the text, if it was scanned upstream
+            
+        Returns:
+            List of unique lowercase terms
+        """
         # Check for known medical terms
-        for term in self.medical_terms_db.keys():
-            if term in text_lower:
-                found_terms.append(term)
+        if preliminary_terms is not None:
+            found_terms = set(preliminary_terms)
+        else:
+            found_terms = {match.lower() for match in _KNOWN_TERMS_RE.findall(text)}
         
         # Also look for common medical patterns
-        import re
-        
-        # Medication patterns (uppercase words, often with numbers)
-        medication_pattern = r'\b[A-Z][A-Z\s]+\d+\s*MG?\b'
-        medications = re.findall(medication_pattern, text)
-        found_terms.extend([med.lower().strip() for med in medications])
+        found_terms.update(med.lower().strip() for med in _MEDICATION_RE.findall(text))
+        found_terms.update(lab_value.lower() for lab_value in _LAB_VALUE_RE.findall(text))
         
-        # Lab value patterns
-        lab_pattern = r'\b(glucose|cholesterol|hdl|ldl|creatinine|bun|sodium|potassium)\b'
-        lab_values = re.findall(lab_pattern, text_lower)
-        found_terms.extend(lab_values)
-        
-        # Remove duplicates and return
-        return list(set(found_terms))
+        return list(found_terms)
     
-    async def _generate_explanations(self, medical_terms: List[str], document_type: str) -> List[Dict[str, str]]:
+    async def _generate_explanations(self, medical_terms: List[str], document_type: str) -> List[ExplainedTerm]:
         """Generate simplified explanations for medical terms."""
-        simplified_terms = []
+        # Generate explanations for unknown terms concurrently (mock AI responses)
+        unknown_terms = [term for term in medical_terms if term not in self.medical_terms_db]
+        ai_explanations = await asyncio.gather(
+            *(self._generate_ai_explanation(term, document_type) for term in unknown_terms)
+        )
+        generated = dict(zip(unknown_terms, ai_explanations))
         
+        simplified_terms = []
         for term in medical_terms:
-            if term in self.medical_terms_db:
-                term_info = self.medical_terms_db[term]
-                simplified_terms.append({
-                    'term': term.title(),
-                    'explanation': term_info['explanation'],
-                    'importance': term_info['importance'],
-                    'category': term_info['category']
-                })
-            else:
-                # Generate explanation for unknown terms (mock AI response)
-                explanation = await self._generate_ai_explanation(term, document_type)
-                simplified_terms.append({
-                    'term': term.title(),
-                    'explanation': explanation['explanation'],
-                    'importance': explanation['importance'],
-                    'category': explanation['category']
-                })
+            term_info = self.medical_terms_db.get(term) or generated[term]
+            simplified_terms.append(ExplainedTerm(
+                term=_DISPLAY_NAMES.get(term) or term.title(),
+                key=term,
+                explanation=term_info['explanation'],
+                importance=term_info['importance'],
+                category=term_info['category']
+            ))
         
         return simplified_terms
     
@@ -2,6 +2,7 @@
 Configuration management for CareCompanion AI.
 """
 import os
+from functools import lru_cache
 from typing import List
 from pydantic_settings import BaseSettings
 
@@ -33,6 +34,9 @@ class Settings(BaseSettings):
         "jpg", "jpeg", "png", "gif", "bmp", "tiff", "webp"
     ]
     
+    # Mock resource lookups sleep to simulate external API calls when enabled
+    simulate_latency: bool = False
+    
     # External APIs (for future implementation)
     google_vision_api_key: str = ""
     gemini_api_key: str = ""
@@ -46,5 +50,7 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the application settings, reading the environment and .env on first use."""
+    return Settings()
@@ -1,15 +1,21 @@
 """
 CareCompanion AI - Main FastAPI application.
 """
+import asyncio
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional, Tuple
+import orjson
 from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.openapi.docs import get_swagger_ui_html
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 
-from config import settings
+from config import get_settings
 from models import (
     DocumentProcessingResponse, 
     HealthCheckResponse, 
@@ -17,12 +23,25 @@ from models import (
     ProcessingStatus
 )
 from services.document_processor import DocumentProcessor
-from utils.validators import validate_file_extension, validate_file_size, validate_content_type
+from utils.validators import validate_upload
 from utils.logger import logger
 
 # Global variables
+settings = get_settings()
 start_time = time.time()
 document_processor = DocumentProcessor()
+_cached_health: Optional[Tuple[int, HealthCheckResponse]] = None
+
+
+@lru_cache(maxsize=1)
+def _format_timestamp(epoch_second: int) -> str:
+    """Format a whole epoch second as a local timestamp string."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(epoch_second))
+
+
+def current_timestamp() -> str:
+    """Return the current timestamp, formatting it at most once per second."""
+    return _format_timestamp(int(time.time()))
 
 
 @asynccontextmanager
@@ -30,6 +49,11 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     logger.info("Starting CareCompanion AI backend...")
+    # Bound the worker threads used for blocking image work so concurrent uploads
+    # cannot grow the thread count without limit
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="carecompanion")
+    )
     yield
     # Shutdown
     logger.info("Shutting down CareCompanion AI backend...")
@@ -41,8 +65,11 @@ app = FastAPI(
     version=settings.version,
     description="AI-powered medical document processing and care plan generation",
     lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc"
+    default_response_class=ORJSONResponse,
+    # Schema and docs pages are served by the routes below so the schema is encoded once
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None
 )
 
 # Add CORS middleware
@@ -50,21 +77,23 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
+    max_age=86400,
 )
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Global HTTP exception handler."""
-    logger.error(f"HTTP {exc.status_code}: {exc.detail}")
-    return JSONResponse(
+    # Status code and detail say everything here; no traceback needed
+    logger.error("HTTP %s: %s", exc.status_code, exc.detail)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(
             error="HTTP_ERROR",
             message=exc.detail,
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
+            timestamp=current_timestamp()
         ).model_dump()
     )
 
@@ -72,14 +101,14 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Global exception handler."""
-    logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.exception("Unexpected error: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error="INTERNAL_ERROR",
             message="An unexpected error occurred",
             details={"error": str(exc)},
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
+            timestamp=current_timestamp()
         ).model_dump()
     )
 
@@ -87,13 +116,19 @@ async def general_exception_handler(request, exc):
 @app.get("/", response_model=HealthCheckResponse)
 async def health_check():
     """Health check endpoint."""
-    uptime = time.time() - start_time
-    return HealthCheckResponse(
-        status="healthy",
-        version=settings.version,
-        timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
-        uptime_seconds=uptime
-    )
+    global _cached_health
+    
+    # Reuse the response for every probe within the same second
+    now = time.time()
+    second = int(now)
+    if _cached_health is None or _cached_health[0] != second:
+        _cached_health = (second, HealthCheckResponse(
+            status="healthy",
+            version=settings.version,
+            timestamp=_format_timestamp(second),
+            uptime_seconds=now - start_time
+        ))
+    return _cached_health[1]
 
 
 @app.get("/health", response_model=HealthCheckResponse)
@@ -113,36 +148,40 @@ async def process_document(file: UploadFile = File(...)):
     Returns:
         DocumentProcessingResponse with extracted text and care plan
     """
-    logger.info(f"Processing document: {file.filename}")
+    logger.info("Processing document: %s", file.filename)
     
     try:
-        # Validate file
-        validate_file_extension(file.filename)
-        validate_content_type(file.content_type)
+        # Size the spooled upload without reading it into memory
+        file_size = file.size
+        if file_size is None:
+            file_size = file.file.seek(0, os.SEEK_END)
+            await file.seek(0)
         
-        # Read file content
-        content = await file.read()
-        validate_file_size(len(content))
+        # Validate file
+        validate_upload(file.filename, file_size, file.content_type)
         
-        # Process document
+        # Process document straight from the spooled upload
         status, response_data = await document_processor.process_document(
-            content, file.filename
+            file.file, file.filename
         )
         
         if status == ProcessingStatus.FAILED:
-            logger.error(f"Document processing failed: {response_data.get('error_message')}")
+            logger.error("Document processing failed: %s", response_data.get('error_message'))
             raise HTTPException(
                 status_code=500,
                 detail=f"Document processing failed: {response_data.get('error_message')}"
             )
         
-        logger.info(f"Document processed successfully in {response_data['processing_time_seconds']:.2f}s")
+        logger.info("Document processed successfully in %.2fs", response_data['processing_time_seconds'])
+        # Nested models built by the processor are not revalidated, but the payload is still checked
         return DocumentProcessingResponse(**response_data)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error processing document: {str(e)}", exc_info=True)
+        logger.error("Unexpected error processing document: %s", e)
+        if settings.debug:
+            logger.debug("Processing traceback", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -177,6 +216,30 @@ def custom_openapi():
 app.openapi = custom_openapi
 
 
+@lru_cache(maxsize=1)
+def _openapi_json() -> bytes:
+    """Encode the OpenAPI schema once per process."""
+    return orjson.dumps(app.openapi())
+
+
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json() -> Response:
+    """Serve the pre-encoded OpenAPI schema."""
+    return Response(content=_openapi_json(), media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui() -> HTMLResponse:
+    """Interactive API documentation."""
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{settings.project_name} - Swagger UI")
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc() -> HTMLResponse:
+    """Alternative API documentation."""
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{settings.project_name} - ReDoc")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -184,5 +247,11 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        # Reload mode only supports a single worker
+        workers=1 if settings.debug else (os.cpu_count() or 1),
+        # "auto" picks uvloop where the platform supports it (not on Windows)
+        loop="auto",
+        http="httptools",
+        access_log=settings.debug,
         log_level=settings.log_level.lower()
     )
\ No newline at end of file
@@ -1,8 +1,9 @@
 """
 Pydantic models for CareCompanion AI.
 """
+from dataclasses import dataclass
 from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 
@@ -32,8 +33,20 @@ class MedicationInfo(BaseModel):
     refills: Optional[int] = Field(None, description="Number of refills")
 
 
+@dataclass(frozen=True, slots=True)
+class ExplainedTerm:
+    """Medical term explained by the translator and passed between agents."""
+    term: str
+    key: str
+    explanation: str
+    importance: str
+    category: str
+
+
 class SimplifiedTerm(BaseModel):
     """Simplified medical term explanation."""
+    model_config = ConfigDict(from_attributes=True)
+    
     term: str = Field(..., description="The medical term")
     explanation: str = Field(..., description="Simple explanation of the term")
     importance: str = Field(..., description="Why this is important for the patient")
@@ -14,34 +14,58 @@ from models import (
     DocumentType,
     ProcessingStatus
 )
-from agents.scribe_agent import ScribeAgent
+from agents.scribe_agent import ImageSource, ScribeAgent
 from agents.translator_agent import TranslatorAgent
 from agents.resource_agent import ResourceAgent
 from agents.planner_agent import PlannerAgent
 
+# Confidence weight of each agent; Scribe and Translator are most important
+_SCRIBE_WEIGHT = 0.3
+_TRANSLATOR_WEIGHT = 0.3
+_RESOURCE_WEIGHT = 0.2
+_PLANNER_WEIGHT = 0.2
+
+# Care plan reported for failed documents; it is only ever serialized, so one instance is shared
+_EMPTY_CARE_PLAN = CarePlan()
+
+
+def _open_image(file_content: ImageSource) -> None:
+    """Parse the image header, closing the image and rewinding streams afterwards."""
+    try:
+        image_stream = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+        # Closing releases the file PIL opened for path inputs; caller-owned streams stay open
+        with Image.open(image_stream):
+            pass
+    except Exception as e:
+        raise ValueError(f"Invalid image file: {str(e)}")
+    finally:
+        # Rewind streams so the agents read the upload from the start
+        if hasattr(file_content, 'seek'):
+            file_content.seek(0)
+
 
 class DocumentProcessor:
     """Handles document processing and AI agent coordination."""
     
     def __init__(self):
-        self.start_time = time.time()
         # Initialize AI agents
         self.scribe_agent = ScribeAgent()
         self.translator_agent = TranslatorAgent()
         self.resource_agent = ResourceAgent()
         self.planner_agent = PlannerAgent()
     
-    async def process_document(self, file_content: bytes, filename: str) -> Tuple[ProcessingStatus, dict]:
+    async def process_document(self, file_content: ImageSource, filename: str) -> Tuple[ProcessingStatus, dict]:
         """
         Process uploaded document and return structured care plan.
         
         Args:
-            file_content: Raw file content
+            file_content: Raw file content, an open binary stream or a file path
             filename: Name of the uploaded file
             
         Returns:
             Tuple of (status, response_data)
         """
+        t0 = time.monotonic()
         try:
             # Validate image
             await self._validate_image(file_content)
@@ -49,7 +73,8 @@ class DocumentProcessor:
             # Initialize processing pipeline data
             pipeline_data = {
                 'image_content': file_content,
-                'filename': filename
+                'filename': filename,
+                'image_validated': True
             }
             
             # Step 1: Scribe Agent - Extract text from image
@@ -66,22 +91,23 @@ class DocumentProcessor:
             
             pipeline_data.update(translator_result['result'])
             
-            # Step 3: Resource Agent - Find cost savings and resources
-            resource_result = await self.resource_agent.execute(pipeline_data)
+            # Steps 3 and 4: Resource Agent (cost savings and resources) and Planner Agent
+            # (care plan) both only read the scribe and translator outputs, so run them together
+            resource_result, planner_result = await asyncio.gather(
+                self.resource_agent.execute(pipeline_data),
+                self.planner_agent.execute(pipeline_data)
+            )
             if resource_result['status'] != 'success':
                 raise Exception(f"Resource agent failed: {resource_result['error']}")
-            
-            pipeline_data.update(resource_result['result'])
-            
-            # Step 4: Planner Agent - Generate care plan
-            planner_result = await self.planner_agent.execute(pipeline_data)
             if planner_result['status'] != 'success':
                 raise Exception(f"Planner agent failed: {planner_result['error']}")
             
+            pipeline_data.update(resource_result['result'])
+            
             # Extract care plan from planner result
             care_plan_data = planner_result['result']['care_plan']
             
-            processing_time = time.time() - self.start_time
+            processing_time = time.monotonic() - t0
             
             return ProcessingStatus.COMPLETED, {
                 "status": ProcessingStatus.COMPLETED,
@@ -90,35 +116,33 @@ class DocumentProcessor:
                 "care_plan": care_plan_data,
                 "processing_time_seconds": processing_time,
                 "confidence_score": self._calculate_confidence_score(scribe_result, translator_result, resource_result, planner_result),
-                "error_message": None,
-                "agent_results": {
-                    "scribe": scribe_result,
-                    "translator": translator_result,
-                    "resource": resource_result,
-                    "planner": planner_result
-                }
+                "error_message": None
             }
             
         except Exception as e:
-            processing_time = time.time() - self.start_time
+            processing_time = time.monotonic() - t0
             return ProcessingStatus.FAILED, {
                 "status": ProcessingStatus.FAILED,
                 "document_type": DocumentType.UNKNOWN,
                 "raw_text": "",
-                "care_plan": CarePlan(),
+                "care_plan": _EMPTY_CARE_PLAN,
                 "processing_time_seconds": processing_time,
                 "confidence_score": 0.0,
                 "error_message": str(e)
             }
     
-    async def _validate_image(self, file_content: bytes) -> None:
-        """Validate uploaded image file."""
-        try:
-            image_stream = io.BytesIO(file_content)
-            image = Image.open(image_stream)
-            image.verify()
-        except Exception as e:
-            raise ValueError(f"Invalid image file: {str(e)}")
+    async def _validate_image(self, file_content: ImageSource) -> None:
+        """
+        Validate uploaded image file by parsing its header.
+        
+        Image.open only reads the header and raises for unrecognised formats, so the
+        pixel data is not decoded here. The read may hit a spooled temporary file on
+        disk, so it runs in a worker thread rather than on the event loop.
+        
+        Raises:
+            ValueError: If PIL does not recognise the image
+        """
+        return await asyncio.to_thread(_open_image, file_content)
     
     def _calculate_confidence_score(self, scribe_result: dict, translator_result: dict, 
                                   resource_result: dict, planner_result: dict) -> float:
@@ -134,10 +158,12 @@ class DocumentProcessor:
         planner_confidence = 0.9 if planner_result['status'] == 'success' else 0.5
         
         # Calculate weighted average
-        weights = [0.3, 0.3, 0.2, 0.2]  # Scribe and Translator are most important
-        confidences = [scribe_confidence, translator_confidence, resource_confidence, planner_confidence]
-        
-        weighted_confidence = sum(w * c for w, c in zip(weights, confidences))
+        weighted_confidence = (
+            _SCRIBE_WEIGHT * scribe_confidence
+            + _TRANSLATOR_WEIGHT * translator_confidence
+            + _RESOURCE_WEIGHT * resource_confidence
+            + _PLANNER_WEIGHT * planner_confidence
+        )
         
         # Ensure confidence is between 0 and 1
         return max(0.0, min(1.0, weighted_confidence))
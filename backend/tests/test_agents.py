@@ -0,0 +1,64 @@
+"""
+Tests for AI agents.
+"""
+import pytest
+from agents.scribe_agent import ScribeAgent, _MOCK_DISCHARGE_TEXT
+from agents.translator_agent import TranslatorAgent
+from agents.planner_agent import PlannerAgent
+
+
+class TestPlannerAgent:
+    """Test PlannerAgent."""
+
+    @pytest.mark.asyncio
+    async def test_discharge_medications_get_their_own_dosage(self):
+        """Test each discharge medication is paired with the dosage on its own line."""
+        raw_text = ScribeAgent()._clean_extracted_text(_MOCK_DISCHARGE_TEXT)
+        translation = await TranslatorAgent().process({
+            'raw_text': raw_text,
+            'document_type': 'discharge_summary'
+        })
+
+        result = await PlannerAgent().process({
+            'raw_text': raw_text,
+            'document_type': 'discharge_summary',
+            'simplified_terms': translation['simplified_terms']
+        })
+
+        dosages = {medication.name: medication.dosage for medication in result['care_plan'].medications}
+        assert dosages == {
+            'Lisinopril': '10MG',
+            'Metformin': '500MG',
+            'Atorvastatin': '20MG'
+        }
+
+    @pytest.mark.asyncio
+    async def test_dose_in_medication_name_is_kept(self):
+        """Test names that end in their dose keep that dose rather than the next medication's."""
+        raw_text = ScribeAgent()._clean_extracted_text(
+            "PRESCRIPTION\n"
+            "ASPIRIN 81 MG TABLET\n"
+            "Take 1 tablet by mouth daily\n"
+            "Qty: 90 Refills: 3\n"
+            "LISINOPRIL 10 MG TABLET\n"
+            "Take 1 tablet by mouth daily\n"
+            "Qty: 30 Refills: 2\n"
+        )
+        translation = await TranslatorAgent().process({
+            'raw_text': raw_text,
+            'document_type': 'prescription'
+        })
+
+        result = await PlannerAgent().process({
+            'raw_text': raw_text,
+            'document_type': 'prescription',
+            'simplified_terms': translation['simplified_terms']
+        })
+
+        details = {
+            medication.name: (medication.dosage, medication.quantity, medication.refills)
+            for medication in result['care_plan'].medications
+        }
+        aspirin = next(name for name in details if 'Aspirin' in name)
+        assert details[aspirin] == ('81 MG', 90, 3)
+        assert details['Lisinopril'] == ('10 MG', 30, 2)
@@ -1,6 +1,7 @@
 """
 Tests for services.
 """
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from services.document_processor import DocumentProcessor
@@ -49,6 +50,24 @@ class TestDocumentProcessor:
             assert response["status"] == ProcessingStatus.FAILED
             assert response["error_message"] is not None
 
+    @pytest.mark.asyncio
+    async def test_processing_time_excludes_processor_age(self, monkeypatch):
+        """Test processing time covers only the call, not how long the processor has existed."""
+        real_monotonic = time.monotonic
+        real_time = time.time
+        
+        # The processor was built in setup_method; move both clocks an hour past that
+        monkeypatch.setattr(time, "monotonic", lambda: real_monotonic() + 3600)
+        monkeypatch.setattr(time, "time", lambda: real_time() + 3600)
+        
+        with patch('PIL.Image.open') as mock_image:
+            mock_image.side_effect = Exception("Invalid image")
+            
+            status, response = await self.processor.process_document(b"invalid_image_content", "test.jpg")
+        
+        assert status == ProcessingStatus.FAILED
+        assert 0 <= response["processing_time_seconds"] < 60
+
     @pytest.mark.asyncio
     async def test_validate_image_success(self):
         """Test successful image validation."""
@@ -3,7 +3,9 @@ Tests for utility functions.
 """
 import pytest
 from fastapi import HTTPException
-from utils.validators import validate_file_extension, validate_file_size, validate_content_type
+from utils.validators import (
+    validate_file_extension, validate_file_size, validate_content_type, validate_upload
+)
 
 
 class TestValidators:
@@ -23,6 +25,18 @@ class TestValidators:
         assert exc_info.value.status_code == 400
         assert "not allowed" in exc_info.value.detail
 
+    def test_validate_file_extension_without_dot(self):
+        """Test a bare extension with no dot is rejected."""
+        with pytest.raises(HTTPException) as exc_info:
+            validate_file_extension("png")
+        assert exc_info.value.status_code == 400
+        assert "not allowed" in exc_info.value.detail
+
+        with pytest.raises(HTTPException) as exc_info:
+            validate_upload("png", 1024, "image/png")
+        assert exc_info.value.status_code == 400
+        assert "not allowed" in exc_info.value.detail
+
     def test_validate_file_extension_no_filename(self):
         """Test validation with no filename."""
         with pytest.raises(HTTPException) as exc_info:
@@ -55,3 +69,19 @@ class TestValidators:
             validate_content_type("text/plain")
         assert exc_info.value.status_code == 400
         assert "not allowed" in exc_info.value.detail
+
+    def test_validate_upload_valid(self):
+        """Test combined validation of an acceptable upload."""
+        # Should not raise exception
+        validate_upload("scan.PNG", 1024, "image/png")
+
+    def test_validate_upload_reports_first_failure(self):
+        """Test combined validation reports the failing check."""
+        with pytest.raises(HTTPException) as exc_info:
+            validate_upload("notes.txt", 1024, "text/plain")
+        assert exc_info.value.status_code == 400
+        assert "File type 'txt' not allowed" in exc_info.value.detail
+        
+        with pytest.raises(HTTPException) as exc_info:
+            validate_upload("scan.jpg", 11 * 1024 * 1024, "image/jpeg")
+        assert "too large" in exc_info.value.detail
@@ -1,50 +1,202 @@
 """
 Logging configuration for CareCompanion AI.
 """
+import atexit
 import logging
+import os
+import queue
+import re
 import sys
-from datetime import datetime
-from config import settings
+import threading
+import warnings
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, List, Optional, Tuple
+from config import get_settings
+
+# Background listener that owns the real handlers, started by setup_logging
+_listener: Optional[QueueListener] = None
+
+# Configured log level, resolved once
+_LEVEL = getattr(logging, get_settings().log_level.upper())
+
+
+class _SecondCachingFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp for records within the same second."""
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted time), replaced as a whole so readers see a consistent pair
+        self._last_time: Tuple[Optional[int], str] = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, cached_time = self._last_time
+        if second == cached_second:
+            return cached_time
+        formatted = super().formatTime(record, datefmt)
+        self._last_time = (second, formatted)
+        return formatted
+
+
+# Shared formatter for every handler; the date format has no sub-second part, so
+# timestamps can be cached per second
+_FORMATTER = _SecondCachingFormatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S',
+    style='%'
+)
+
+# Characters of formatted records buffered before the log file is written
+_FILE_BUFFER_SIZE = 64 * 1024
+# Seconds between flushes of the log file buffer
+_FILE_FLUSH_INTERVAL = 5.0
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that batches formatted records instead of writing each one.
+    
+    Complete records are collected in memory and written with a single os.write on the
+    append-mode file, so several worker processes sharing the log never split a record.
+    The buffer is flushed when it reaches _FILE_BUFFER_SIZE, on ERROR and above, on close
+    and by whoever calls flush() periodically.
+    """
+    
+    def __init__(self, filename: str, mode: str = 'a', encoding: Optional[str] = None,
+                 delay: bool = False, errors: Optional[str] = None) -> None:
+        super().__init__(filename, mode, encoding, delay, errors)
+        self._pending: List[str] = []
+        self._pending_size = 0
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record) + self.terminator
+            self._pending.append(message)
+            self._pending_size += len(message)
+            # Keep crash diagnostics on disk even if the process dies right after
+            if self._pending_size >= _FILE_BUFFER_SIZE or record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if not self._pending:
+                return
+            # close() clears the stream; reopen like FileHandler does (typeshed types it as never None)
+            if self.stream is None:
+                self.stream = self._open()  # type: ignore[unreachable]
+            data = ''.join(self._pending).encode(self.encoding or 'utf-8', self.errors or 'strict')
+            self._pending.clear()
+            self._pending_size = 0
+            # Bypass the stream's own buffer so the whole batch is one append-mode write
+            os.write(self.stream.fileno(), data)
+        finally:
+            self.release()
+
+
+# A str.format replacement field such as {name}, {0}, {} or {value:.2f}; JSON and dict
+# literals ({"key": ...}, {'key': ...}) do not match
+_FORMAT_FIELD_RE = re.compile(r'\{(?:[A-Za-z_]\w*|\d+)?(?:![rsa])?(?::[^{}"\']*)?\}')
+
+
+class LazyFilter(logging.Filter):
+    """
+    Migration aid that warns once about messages that look like unformatted templates.
+    
+    Callers should pass %-style arguments, e.g. logger.info("Processing %s", name), so
+    messages are only formatted when a handler emits them.
+    """
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self._warned = False
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self._warned and not record.args and _FORMAT_FIELD_RE.search(str(record.msg)):
+            self._warned = True
+            # Attribute the warning to the logging call rather than to this filter
+            warnings.warn_explicit(
+                f"Log message looks like a str.format template; use %-style arguments instead: {record.msg!r}",
+                RuntimeWarning,
+                record.pathname,
+                record.lineno,
+                module=record.module
+            )
+        return True
+
+
+def _flush_periodically(handler: logging.Handler, interval: float) -> None:
+    """Flush a handler every interval seconds from a daemon thread."""
+    def run() -> None:
+        while not stop.wait(interval):
+            handler.flush()
+    
+    stop = threading.Event()
+    threading.Thread(target=run, name="carecompanion-log-flush", daemon=True).start()
+    atexit.register(stop.set)
 
 
 def setup_logging() -> logging.Logger:
     """
     Set up logging configuration.
     
+    The logger itself only gets a QueueHandler, so the handler I/O runs on a background
+    QueueListener thread. QueueHandler.prepare() still merges the message arguments and
+    formats any traceback in the calling thread before the record is queued.
+    
+    Log with %-style arguments (logger.info("Processing %s", name)) rather than
+    f-strings so disabled levels skip formatting; outside production, or with debug
+    on, LazyFilter flags messages that look like unformatted templates.
+    
     Returns:
         Configured logger instance
     """
+    global _listener
+    settings = get_settings()
+    
     # Create logger
     logger = logging.getLogger("carecompanion")
-    logger.setLevel(getattr(logging, settings.log_level.upper()))
+    logger.setLevel(_LEVEL)
     
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, settings.log_level.upper()))
-    console_handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(console_handler)
+    handlers: List[logging.Handler] = []
     
-    # Add file handler in production
-    if settings.environment == "production":
-        file_handler = logging.FileHandler("carecompanion.log")
+    # Log to the console outside production, and to a file in production
+    if settings.environment != "production":
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(_LEVEL)
+        console_handler.setFormatter(_FORMATTER)
+        handlers.append(console_handler)
+    else:
+        file_handler = BufferedFileHandler("carecompanion.log", encoding="utf-8")
         file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(_FORMATTER)
+        # Quiet periods are covered by the periodic flush
+        _flush_periodically(file_handler, _FILE_FLUSH_INTERVAL)
+        handlers.append(file_handler)
+    
+    # Hand records to the listener thread instead of writing them inline
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
+    # The template check costs a regex search per record, so keep it out of production
+    if settings.environment != "production" or settings.debug:
+        logger.addFilter(LazyFilter())
     
     return logger
 
 
 # Global logger instance
 logger = setup_logging()
+
+
+def get_logger() -> logging.Logger:
+    """Return the shared application logger without going through logging.getLogger."""
+    return logger
@@ -1,10 +1,29 @@
 """
 Validation utilities for CareCompanion AI.
 """
-import os
-from typing import List
 from fastapi import HTTPException
-from config import settings
+from config import get_settings
+
+# Allowed image MIME types, in the order listed in error messages
+_ALLOWED_CONTENT_TYPES = (
+    "image/jpeg",
+    "image/jpg",
+    "image/png",
+    "image/gif",
+    "image/bmp",
+    "image/tiff",
+    "image/webp"
+)
+_ALLOWED_CONTENT_TYPES_SET = frozenset(_ALLOWED_CONTENT_TYPES)
+_ALLOWED_CONTENT_TYPES_SUFFIX = f"Allowed types: {', '.join(_ALLOWED_CONTENT_TYPES)}"
+
+# Allowed file extensions, lowercased for case-insensitive lookups
+_ALLOWED_EXT = frozenset(extension.lower() for extension in get_settings().allowed_extensions)
+_ALLOWED_EXT_SUFFIX = f"Allowed types: {', '.join(get_settings().allowed_extensions)}"
+
+# Upload size limit in bytes and the message reported when it is exceeded
+_MAX_SIZE_BYTES = get_settings().max_file_size_mb * 1024 * 1024
+_FILE_TOO_LARGE_DETAIL = f"File too large. Maximum size: {get_settings().max_file_size_mb}MB"
 
 
 def validate_file_extension(filename: str) -> None:
@@ -20,11 +39,13 @@ def validate_file_extension(filename: str) -> None:
     if not filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     
-    file_extension = filename.lower().split('.')[-1]
-    if file_extension not in settings.allowed_extensions:
+    # Text after the last dot (the whole name if there is none), lowercased
+    _, dot, file_extension = filename.rpartition('.')
+    file_extension = file_extension.lower()
+    if not dot or file_extension not in _ALLOWED_EXT:
         raise HTTPException(
             status_code=400,
-            detail=f"File type '{file_extension}' not allowed. Allowed types: {', '.join(settings.allowed_extensions)}"
+            detail=f"File type '{file_extension}' not allowed. {_ALLOWED_EXT_SUFFIX}"
         )
 
 
@@ -38,12 +59,8 @@ def validate_file_size(file_size: int) -> None:
     Raises:
         HTTPException: If file size exceeds maximum
     """
-    max_size_bytes = settings.max_file_size_mb * 1024 * 1024
-    if file_size > max_size_bytes:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size: {settings.max_file_size_mb}MB"
-        )
+    if file_size > _MAX_SIZE_BYTES:
+        raise HTTPException(status_code=400, detail=_FILE_TOO_LARGE_DETAIL)
 
 
 def validate_content_type(content_type: str) -> None:
@@ -56,18 +73,34 @@ def validate_content_type(content_type: str) -> None:
     Raises:
         HTTPException: If content type is not allowed
     """
-    allowed_types = [
-        "image/jpeg",
-        "image/jpg", 
-        "image/png",
-        "image/gif",
-        "image/bmp",
-        "image/tiff",
-        "image/webp"
-    ]
-    
-    if content_type not in allowed_types:
+    if content_type not in _ALLOWED_CONTENT_TYPES_SET:
         raise HTTPException(
             status_code=400,
-            detail=f"Content type '{content_type}' not allowed. Allowed types: {', '.join(allowed_types)}"
+            detail=f"Content type '{content_type}' not allowed. {_ALLOWED_CONTENT_TYPES_SUFFIX}"
         )
+
+
+def validate_upload(filename: str, file_size: int, content_type: str) -> None:
+    """
+    Validate an upload's extension, content type and size in one call.
+    
+    Accepted uploads pass a single combined check; rejected ones rerun the
+    individual validators so the first failing check reports its usual error.
+    
+    Args:
+        filename: Name of the file to validate
+        file_size: Size of the file in bytes
+        content_type: MIME type of the file
+        
+    Raises:
+        HTTPException: If any check fails
+    """
+    _, dot, file_extension = (filename or '').rpartition('.')
+    if (dot and file_extension.lower() in _ALLOWED_EXT
+            and content_type in _ALLOWED_CONTENT_TYPES_SET
+            and file_size <= _MAX_SIZE_BYTES):
+        return
+    
+    validate_file_extension(filename)
+    validate_content_type(content_type)
+    validate_file_size(file_size)